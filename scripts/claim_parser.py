@@ -1,10 +1,13 @@
 """Parse and extract claims from Claude's responses."""
 
 import re
+from bisect import bisect_left
+from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import lru_cache
 
 
-@dataclass
+@dataclass(slots=True)
 class Claim:
     """A claim extracted from Claude's response."""
     claim_type: str
@@ -13,8 +16,7 @@ class Claim:
     extracted_value: str | None = None  # e.g., file path for file_created
 
 
-# Claim detection patterns with confidence weights
-# Note: For file_created patterns, we search on original text to preserve paths
+# Claim detection patterns with confidence weights, matched case-insensitively
 CLAIM_PATTERNS: dict[str, list[tuple[str, float]]] = {
     "file_created": [
         # High confidence - explicit creation statements
@@ -64,7 +66,113 @@ CLAIM_PATTERNS: dict[str, list[tuple[str, float]]] = {
 }
 
 
-def parse_claims(text: str, confidence_threshold: float = 0.7) -> list[Claim]:
+# Every pattern above requires at least one of these words (lowercase), so
+# text containing none of them can't hold a claim. Keep this in sync when
+# adding patterns.
+_CLAIM_KEYWORDS = (
+    "test", "lint", "build", "built", "compile", "error", "issue", "warning",
+    "fix", "resolv", "address", "correct", "creat", "wrote", "written",
+    "added", "generated", "saved", "file",
+)
+
+
+def _may_contain_claims(text: str) -> bool:
+    """
+    Cheaply rule out text that no claim pattern can match.
+
+    Substring checks run in C and are far cheaper than the claim patterns.
+    The check only applies to ASCII text: IGNORECASE also folds a few
+    non-ASCII letters (e.g. the Kelvin sign) onto ASCII ones.
+    """
+    if not text.isascii():
+        return True
+    lowered = text.lower()
+    return any(keyword in lowered for keyword in _CLAIM_KEYWORDS)
+
+
+# Distinct confidence levels, ascending. Any threshold selects the same
+# patterns as the lowest level at or above it.
+_CONFIDENCE_LEVELS = sorted({
+    confidence for patterns in CLAIM_PATTERNS.values() for _, confidence in patterns
+})
+
+
+def _normalize_threshold(confidence_threshold: float) -> float:
+    """Map a threshold to the confidence level that selects the same patterns."""
+    index = bisect_left(_CONFIDENCE_LEVELS, confidence_threshold)
+    if index == len(_CONFIDENCE_LEVELS):
+        return confidence_threshold
+    return _CONFIDENCE_LEVELS[index]
+
+
+@lru_cache(maxsize=16)
+def _compiled_patterns(
+    confidence_threshold: float,
+) -> tuple[tuple[str, tuple[tuple[re.Pattern[str], float], ...]], ...]:
+    """
+    Compile the patterns at or above a threshold.
+
+    Patterns stay separate, in CLAIM_PATTERNS order, rather than being fused
+    into one alternation: a fused scan reports only the leftmost match at
+    each position, which hides file claims overlapping another pattern's
+    match and the higher-priority pattern of other claim types.
+
+    This stays on the stdlib ``re`` engine: multi-pattern DFA engines such
+    as Hyperscan don't report capture groups, which file_created relies on
+    for the path, and the hooks are kept free of runtime dependencies.
+
+    Returns:
+        Tuples of (claim type, ((pattern, confidence), ...)) for the claim
+        types with at least one pattern left
+    """
+    compiled = []
+    for claim_type, patterns in CLAIM_PATTERNS.items():
+        selected = tuple(
+            (re.compile(pattern, re.IGNORECASE | re.MULTILINE), confidence)
+            for pattern, confidence in patterns
+            if confidence >= confidence_threshold
+        )
+        if selected:
+            compiled.append((claim_type, selected))
+    return tuple(compiled)
+
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.7
+
+# Compile the patterns for the default threshold up front, so the first
+# parse_claims call doesn't pay for it
+_compiled_patterns(_normalize_threshold(DEFAULT_CONFIDENCE_THRESHOLD))
+
+
+def _iter_matches(text: str,
+                  confidence_threshold: float) -> Iterator[tuple[re.Match[str], str, float]]:
+    """
+    Yield claim matches in CLAIM_PATTERNS order.
+
+    Every file_created pattern is scanned in full. For the other claim types
+    only the first match of the highest-priority pattern that matches at
+    all is yielded, since a single claim of each type is kept.
+
+    Yields:
+        Tuples of (match, claim type, confidence)
+    """
+    # Patterns match case-insensitively on the original text, which
+    # preserves file path case without making a lowercased copy
+    for claim_type, patterns in _compiled_patterns(_normalize_threshold(confidence_threshold)):
+        for pattern, confidence in patterns:
+            if claim_type == "file_created":
+                for match in pattern.finditer(text):
+                    yield match, claim_type, confidence
+                continue
+
+            match = pattern.search(text)
+            if match is not None:
+                yield match, claim_type, confidence
+                break
+
+
+def parse_claims(text: str,
+                 confidence_threshold: float = DEFAULT_CONFIDENCE_THRESHOLD) -> list[Claim]:
     """
     Parse text for claims that can be verified.
 
@@ -75,48 +183,46 @@ def parse_claims(text: str, confidence_threshold: float = 0.7) -> list[Claim]:
     Returns:
         List of Claim objects found in the text
     """
+    if not _may_contain_claims(text):
+        return []
+
     claims = []
+    seen_files: set[str] = set()
 
-    for claim_type, patterns in CLAIM_PATTERNS.items():
-        for pattern, confidence in patterns:
-            if confidence < confidence_threshold:
+    for match, claim_type, confidence in _iter_matches(text, confidence_threshold):
+        # Extract any captured value (e.g., file path)
+        extracted_value = match.group(1) if match.re.groups else None
+
+        # Avoid duplicate file claims with the same value; other claim
+        # types are only yielded once
+        if claim_type == "file_created" and extracted_value:
+            if extracted_value in seen_files:
                 continue
+            seen_files.add(extracted_value)
 
-            # For file_created, search on original text to preserve file path case
-            # For other claims, use case-insensitive matching
-            search_text = text if claim_type == "file_created" else text.lower()
-            matches = re.finditer(pattern, search_text, re.IGNORECASE | re.MULTILINE)
-
-            for match in matches:
-                # Extract the matched claim text
-                claim_text = match.group(0)
-
-                # Extract any captured value (e.g., file path)
-                extracted_value = None
-                if match.groups():
-                    extracted_value = match.group(1)
-
-                # Avoid duplicate claims of the same type with same value
-                existing = [c for c in claims if c.claim_type == claim_type]
-                if claim_type == "file_created":
-                    # For files, check if extracted value already captured
-                    if extracted_value and any(c.extracted_value == extracted_value for c in existing):
-                        continue
-                else:
-                    # For other claims, just check we don't have the same type already
-                    if existing:
-                        continue
-
-                claims.append(Claim(
-                    claim_type=claim_type,
-                    claim_text=claim_text,
-                    confidence=confidence,
-                    extracted_value=extracted_value
-                ))
+        claims.append(Claim(
+            claim_type=claim_type,
+            claim_text=match.group(0),
+            confidence=confidence,
+            extracted_value=extracted_value
+        ))
 
     return claims
 
 
+# Paths in backticks, double or single quotes (the opening and closing quote
+# must match, so each kind gets its own group), or bare absolute and ./
+# relative paths. Each alternative has exactly one group, so the path is
+# always match.group(match.lastindex).
+_FILE_PATH_RE = re.compile(
+    r"`([^\s`]+\.[a-zA-Z0-9]+)`"
+    r'|"([^\s"]+\.[a-zA-Z0-9]+)"'
+    r"|'([^\s']+\.[a-zA-Z0-9]+)'"
+    r"|(?:^|(?<=[\s(]))((?:\./|/)[^\s:,)]+\.[a-zA-Z0-9]+)",
+    re.MULTILINE
+)
+
+
 def extract_file_paths(text: str) -> list[str]:
     """
     Extract file paths mentioned in text.
@@ -125,38 +231,12 @@ def extract_file_paths(text: str) -> list[str]:
         text: Text to search for file paths
 
     Returns:
-        List of file paths found
+        List of file paths found, in the order they first appear
     """
-    paths = []
-
-    # Match paths in backticks or quotes
-    quoted_patterns = [
-        r'`([^\s`]+\.[a-zA-Z0-9]+)`',
-        r'"([^\s"]+\.[a-zA-Z0-9]+)"',
-        r"'([^\s']+\.[a-zA-Z0-9]+)'",
-    ]
-
-    for pattern in quoted_patterns:
-        matches = re.findall(pattern, text)
-        paths.extend(matches)
-
-    # Match Unix-style paths
-    unix_pattern = r'(?:^|[\s(])(/[^\s:,)]+\.[a-zA-Z0-9]+)'
-    paths.extend(re.findall(unix_pattern, text))
-
-    # Match relative paths
-    relative_pattern = r'(?:^|[\s(])(\./[^\s:,)]+\.[a-zA-Z0-9]+)'
-    paths.extend(re.findall(relative_pattern, text))
-
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_paths = []
-    for path in paths:
-        if path not in seen:
-            seen.add(path)
-            unique_paths.append(path)
-
-    return unique_paths
+    # One scan for all path forms; dict.fromkeys drops repeats in order
+    return list(dict.fromkeys(
+        match.group(match.lastindex) for match in _FILE_PATH_RE.finditer(text)
+    ))
 
 
 def get_claim_summary(claims: list[Claim]) -> dict[str, list[str]]:
@@ -169,14 +249,11 @@ def get_claim_summary(claims: list[Claim]) -> dict[str, list[str]]:
     Returns:
         Dictionary mapping claim types to extracted values or claim texts
     """
-    summary: dict[str, list[str]] = {}
+    # Dicts keep first-seen order and make the duplicate check O(1)
+    summary: dict[str, dict[str, None]] = {}
 
     for claim in claims:
-        if claim.claim_type not in summary:
-            summary[claim.claim_type] = []
-
         value = claim.extracted_value or claim.claim_text
-        if value not in summary[claim.claim_type]:
-            summary[claim.claim_type].append(value)
+        summary.setdefault(claim.claim_type, {})[value] = None
 
-    return summary
+    return {claim_type: list(values) for claim_type, values in summary.items()}
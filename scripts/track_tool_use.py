@@ -31,9 +31,8 @@ def read_hook_input() -> dict[str, Any]:
         return {}
 
 
-def is_test_command(command: str) -> bool:
-    """Check if a command is running tests."""
-    test_patterns = [
+_TEST_RE = re.compile(
+    "|".join([
         r'\bnpm\s+test\b',
         r'\bnpm\s+run\s+test',
         r'\byarn\s+test\b',
@@ -45,14 +44,12 @@ def is_test_command(command: str) -> bool:
         r'\bmocha\b',
         r'\bjest\b',
         r'\bvitest\b',
-    ]
-    command_lower = command.lower()
-    return any(re.search(p, command_lower) for p in test_patterns)
-
+    ]),
+    re.IGNORECASE,
+)
 
-def is_lint_command(command: str) -> bool:
-    """Check if a command is running a linter."""
-    lint_patterns = [
+_LINT_RE = re.compile(
+    "|".join([
         r'\bnpm\s+run\s+lint\b',
         r'\byarn\s+lint\b',
         r'\beslint\b',
@@ -63,14 +60,12 @@ def is_lint_command(command: str) -> bool:
         r'\bcargo\s+clippy\b',
         r'\bgolangci-lint\b',
         r'\brubocop\b',
-    ]
-    command_lower = command.lower()
-    return any(re.search(p, command_lower) for p in lint_patterns)
-
+    ]),
+    re.IGNORECASE,
+)
 
-def is_build_command(command: str) -> bool:
-    """Check if a command is building the project."""
-    build_patterns = [
+_BUILD_RE = re.compile(
+    "|".join([
         r'\bnpm\s+run\s+build\b',
         r'\byarn\s+build\b',
         r'\bcargo\s+build\b',
@@ -81,9 +76,26 @@ def is_build_command(command: str) -> bool:
         r'\btsc\b',
         r'\bwebpack\b',
         r'\bvite\s+build\b',
-    ]
-    command_lower = command.lower()
-    return any(re.search(p, command_lower) for p in build_patterns)
+    ]),
+    re.IGNORECASE,
+)
+
+_EXIT_CODE_RE = re.compile(r'exit code[:\s]+(\d+)', re.IGNORECASE)
+
+
+def is_test_command(command: str) -> bool:
+    """Check if a command is running tests."""
+    return bool(_TEST_RE.search(command))
+
+
+def is_lint_command(command: str) -> bool:
+    """Check if a command is running a linter."""
+    return bool(_LINT_RE.search(command))
+
+
+def is_build_command(command: str) -> bool:
+    """Check if a command is building the project."""
+    return bool(_BUILD_RE.search(command))
 
 
 def main() -> int:
@@ -99,43 +111,38 @@ def main() -> int:
 
     logger = get_logger(debug=False)
 
-    # Initialize session state
-    state = SessionState(session_id)
-
     try:
-        if tool_name in ("Write", "Edit"):
-            # Track file operations
-            file_path = tool_input.get("file_path", "")
-            if file_path:
-                state.add_file_written(file_path, tool_name)
-                logger.debug(f"Tracked file write: {file_path}")
-
-        elif tool_name == "Bash":
-            # Track command executions
-            command = tool_input.get("command", "")
-            if command:
-                # Get exit code from output if available
-                exit_code = 0
-                if isinstance(tool_output, dict):
-                    exit_code = tool_output.get("exit_code", 0)
-                elif isinstance(tool_output, str):
-                    # Try to extract exit code from output string
-                    if "exit code" in tool_output.lower():
-                        try:
-                            match = re.search(r'exit code[:\s]+(\d+)', tool_output.lower())
-                            if match:
-                                exit_code = int(match.group(1))
-                        except (ValueError, AttributeError):
-                            pass
-
-                state.add_command_run(
-                    command=command,
-                    exit_code=exit_code,
-                    is_test=is_test_command(command),
-                    is_lint=is_lint_command(command),
-                    is_build=is_build_command(command)
-                )
-                logger.debug(f"Tracked command: {command[:50]}...")
+        # Initialize session state; writes are flushed once when the block exits
+        with SessionState(session_id) as state:
+            if tool_name in ("Write", "Edit"):
+                # Track file operations
+                file_path = tool_input.get("file_path", "")
+                if file_path:
+                    state.add_file_written(file_path, tool_name)
+                    logger.debug(f"Tracked file write: {file_path}")
+
+            elif tool_name == "Bash":
+                # Track command executions
+                command = tool_input.get("command", "")
+                if command:
+                    # Get exit code from output if available
+                    exit_code = 0
+                    if isinstance(tool_output, dict):
+                        exit_code = tool_output.get("exit_code", 0)
+                    elif isinstance(tool_output, str):
+                        # Try to extract exit code from output string
+                        match = _EXIT_CODE_RE.search(tool_output)
+                        if match:
+                            exit_code = int(match.group(1))
+
+                    state.add_command_run(
+                        command=command,
+                        exit_code=exit_code,
+                        is_test=is_test_command(command),
+                        is_lint=is_lint_command(command),
+                        is_build=is_build_command(command)
+                    )
+                    logger.debug(f"Tracked command: {command[:50]}...")
 
     except Exception as e:
         logger.error(f"Error tracking tool use: {str(e)}")
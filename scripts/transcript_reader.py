@@ -1,10 +1,14 @@
 """Read and parse Claude Code transcript JSONL files."""
 
-import json
-from collections.abc import Generator
+import mmap
+from collections.abc import Generator, Iterator
 from pathlib import Path
 from typing import Any
 
+from utils import jsonio
+
+_READ_BUFFER_SIZE = 1 << 20
+
 
 def read_transcript(transcript_path: str) -> Generator[dict[str, Any], None, None]:
     """
@@ -20,21 +24,41 @@ def read_transcript(transcript_path: str) -> Generator[dict[str, Any], None, Non
     if not path.exists():
         return
 
-    with open(path, encoding='utf-8') as f:
+    # Lines are parsed as bytes, so nothing is decoded until the JSON parser
+    # needs it; a large buffer keeps reads of long transcripts cheap
+    with open(path, 'rb', buffering=_READ_BUFFER_SIZE) as f:
         for line in f:
             line = line.strip()
             if not line:
                 continue
             try:
-                yield json.loads(line)
-            except json.JSONDecodeError:
+                yield jsonio.loads(line)
+            except (jsonio.JSONDecodeError, UnicodeDecodeError):
                 continue
 
 
+def _iter_line_spans_reversed(buf: mmap.mmap) -> Iterator[tuple[int, int]]:
+    """
+    Yield the (start, end) offsets of the lines in a mapped file, last first.
+
+    Newlines are found with rfind on the mapping, so nothing is copied and
+    only the pages the caller actually scans are read in.
+    """
+    end = len(buf)
+    while end > 0:
+        start = buf.rfind(b"\n", 0, end) + 1
+        yield start, end
+        end = start - 1
+
+
 def get_last_assistant_messages(transcript_path: str, count: int = 3) -> list[dict[str, Any]]:
     """
     Get the last N assistant messages from the transcript.
 
+    The transcript is memory-mapped and scanned backwards, stopping once N
+    messages are found, so the cost doesn't grow with the length of the
+    session and only the lines that get parsed are copied out.
+
     Args:
         transcript_path: Path to the JSONL transcript file
         count: Number of messages to retrieve
@@ -42,14 +66,46 @@ def get_last_assistant_messages(transcript_path: str, count: int = 3) -> list[di
     Returns:
         List of assistant messages (most recent last)
     """
-    assistant_messages = []
-
-    for message in read_transcript(transcript_path):
-        if message.get("type") == "assistant":
-            assistant_messages.append(message)
-
-    # Return last N messages
-    return assistant_messages[-count:] if len(assistant_messages) >= count else assistant_messages
+    if count <= 0:
+        return []
+
+    assistant_messages: list[dict[str, Any]] = []
+    try:
+        with (
+            open(transcript_path, 'rb') as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf,
+        ):
+            for start, end in _iter_line_spans_reversed(buf):
+                # Cheap check before parsing: user messages and tool results
+                # that never mention "assistant" are skipped uncopied
+                if buf.find(b'"assistant"', start, end) == -1:
+                    continue
+                try:
+                    message = jsonio.loads(buf[start:end])
+                except (jsonio.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                if isinstance(message, dict) and message.get("type") == "assistant":
+                    assistant_messages.append(message)
+                    if len(assistant_messages) == count:
+                        break
+    except (OSError, ValueError):
+        # ValueError: empty files can't be mapped
+        return []
+
+    assistant_messages.reverse()
+    return assistant_messages
+
+
+def _extend_from_content(content: Any, out: list[str]) -> None:
+    """Append the text held by a content field (string or list of blocks) to out."""
+    if isinstance(content, str):
+        out.append(content)
+    elif isinstance(content, list):
+        for block in content:
+            if isinstance(block, str):
+                out.append(block)
+            elif isinstance(block, dict) and block.get("type") == "text":
+                out.append(block.get("text", ""))
 
 
 def extract_assistant_text(message: dict[str, Any]) -> str:
@@ -67,7 +123,7 @@ def extract_assistant_text(message: dict[str, Any]) -> str:
     Returns:
         Combined text content from the message
     """
-    text_parts = []
+    text_parts: list[str] = []
 
     # Direct message field
     if "message" in message:
@@ -76,29 +132,11 @@ def extract_assistant_text(message: dict[str, Any]) -> str:
             text_parts.append(msg)
         elif isinstance(msg, dict):
             # Check for content field
-            content = msg.get("content", [])
-            if isinstance(content, str):
-                text_parts.append(content)
-            elif isinstance(content, list):
-                for block in content:
-                    if isinstance(block, str):
-                        text_parts.append(block)
-                    elif isinstance(block, dict):
-                        if block.get("type") == "text":
-                            text_parts.append(block.get("text", ""))
+            _extend_from_content(msg.get("content", []), text_parts)
 
     # Direct content field
     if "content" in message:
-        content = message["content"]
-        if isinstance(content, str):
-            text_parts.append(content)
-        elif isinstance(content, list):
-            for block in content:
-                if isinstance(block, str):
-                    text_parts.append(block)
-                elif isinstance(block, dict):
-                    if block.get("type") == "text":
-                        text_parts.append(block.get("text", ""))
+        _extend_from_content(message["content"], text_parts)
 
     return "\n".join(text_parts)
 
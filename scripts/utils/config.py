@@ -1,9 +1,25 @@
 """Configuration loading with project override support."""
 
-import json
+import copy
+import os
 from pathlib import Path
 from typing import Any
 
+from . import jsonio
+
+# Merged configs keyed by (default path, project path), stored with the
+# (mtime_ns, size) of both files at the time they were read
+_CONFIG_CACHE: dict[tuple[str, str], tuple[tuple[Any, Any], dict[str, Any]]] = {}
+
+
+def _file_signature(path: Path) -> tuple[int, int] | None:
+    """Get (mtime_ns, size) for a file, or None if it can't be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
 
 def load_config(cwd: str, plugin_root: str | None = None) -> dict[str, Any]:
     """
@@ -12,38 +28,60 @@ def load_config(cwd: str, plugin_root: str | None = None) -> dict[str, Any]:
     Priority:
     1. Project config: {cwd}/.claude/verify-claims.json
     2. Default config: {plugin_root}/config/default_config.json
-    """
-    config = {}
 
+    The merged result is cached until either file changes; callers always
+    get their own copy.
+    """
     # Load default config
     if plugin_root:
         default_path = Path(plugin_root) / "config" / "default_config.json"
     else:
         default_path = Path(__file__).parent.parent.parent / "config" / "default_config.json"
 
-    if default_path.exists():
-        with open(default_path) as f:
-            config = json.load(f)
+    project_config_path = Path(cwd) / ".claude" / "verify-claims.json"
+
+    cache_key = (str(default_path), str(project_config_path))
+    signature = (_file_signature(default_path), _file_signature(project_config_path))
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+
+    config = {}
+
+    if signature[0] is not None:
+        with open(default_path, 'rb') as f:
+            config = jsonio.loads(f.read())
 
     # Load project overrides
-    project_config_path = Path(cwd) / ".claude" / "verify-claims.json"
-    if project_config_path.exists():
-        with open(project_config_path) as f:
-            project_config = json.load(f)
+    if signature[1] is not None:
+        with open(project_config_path, 'rb') as f:
+            project_config = jsonio.loads(f.read())
         config = deep_merge(config, project_config)
 
-    return config
+    _CONFIG_CACHE[cache_key] = (signature, config)
+    return copy.deepcopy(config)
 
 
 def deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
-    """Deep merge override into base config."""
-    result = base.copy()
+    """
+    Deep merge override into base config.
 
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = deep_merge(result[key], value)
-        else:
-            result[key] = value
+    Neither input is modified. Only the dicts along the override's paths are
+    copied; subtrees the override doesn't touch are shared with base.
+    """
+    result = dict(base)
+    stack = [(result, override)]
+
+    while stack:
+        dst, src = stack.pop()
+        for key, value in src.items():
+            current = dst.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                merged = dict(current)
+                dst[key] = merged
+                stack.append((merged, value))
+            else:
+                dst[key] = value
 
     return result
 
@@ -1,12 +1,20 @@
 """Debug logging for verify-claims plugin."""
 
+import atexit
 import sys
-from datetime import datetime
+import time
 from pathlib import Path
+from typing import TextIO
 
 
 class Logger:
-    """Simple logger that writes to stderr and optionally to a file."""
+    """
+    Simple logger that writes to stderr and optionally to a file.
+
+    File output is buffered and written out when the process exits, so a
+    hook run costs a write or two however much it logs. Warnings and errors
+    flush the buffer straight away so they survive a hook that gets killed.
+    """
 
     LOG_DIR = Path.home() / ".claude" / "logs"
     LOG_FILE = "verify_claims.log"
@@ -14,10 +22,41 @@ class Logger:
     def __init__(self, debug: bool = False, log_to_file: bool = True):
         self.debug_enabled = debug
         self.log_to_file = log_to_file
-        self._log_file_handle = None
+        self._log_file_handle: TextIO | None = None
+        self._log_file_failed = False
 
     def _get_timestamp(self) -> str:
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        lt = time.localtime()
+        return (
+            f"{lt.tm_year:04d}-{lt.tm_mon:02d}-{lt.tm_mday:02d} "
+            f"{lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}"
+        )
+
+    def _ensure_handle(self) -> TextIO | None:
+        """Open the log file on first use and keep it open for the process."""
+        if self._log_file_handle is None and not self._log_file_failed:
+            try:
+                self.LOG_DIR.mkdir(parents=True, exist_ok=True)
+                self._log_file_handle = open(self.LOG_DIR / self.LOG_FILE, 'a')
+                atexit.register(self._close)
+            except OSError:
+                # Don't retry on every message
+                self._log_file_failed = True
+        return self._log_file_handle
+
+    def flush(self) -> None:
+        """Write buffered log lines to the log file."""
+        if self._log_file_handle is not None:
+            try:
+                self._log_file_handle.flush()
+            except OSError:
+                pass
+
+    def _close(self) -> None:
+        """Close the log file if it is open."""
+        if self._log_file_handle is not None:
+            self._log_file_handle.close()
+            self._log_file_handle = None
 
     def _write(self, level: str, message: str) -> None:
         """Write log message to stderr and optionally to file."""
@@ -31,13 +70,14 @@ class Logger:
 
         # Write to log file if enabled
         if self.log_to_file:
-            try:
-                self.LOG_DIR.mkdir(parents=True, exist_ok=True)
-                log_path = self.LOG_DIR / self.LOG_FILE
-                with open(log_path, 'a') as f:
-                    f.write(formatted + "\n")
-            except OSError:
-                pass
+            handle = self._ensure_handle()
+            if handle is not None:
+                try:
+                    handle.write(formatted + "\n")
+                    if level in ("WARN", "ERROR"):
+                        handle.flush()
+                except OSError:
+                    pass
 
     def debug(self, message: str) -> None:
         """Log debug message (only if debug is enabled)."""
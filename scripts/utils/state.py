@@ -1,12 +1,14 @@
 """Session state management for tracking tool use and verification results."""
 
-import json
 import os
 import time
-from dataclasses import asdict, dataclass, field
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from . import jsonio
+
 
 @dataclass
 class ToolUseRecord:
@@ -28,24 +30,45 @@ class VerificationResult:
 
 
 class SessionState:
-    """Manages session-scoped state for verification tracking."""
+    """
+    Manages session-scoped state for verification tracking.
+
+    Each mutation is written to disk immediately, unless the state is used
+    as a context manager, in which case writes are batched and flushed once
+    when the block exits:
+
+        with SessionState(session_id) as state:
+            state.add_file_written(path, "Write")
+    """
 
     STATE_DIR = Path.home() / ".claude"
     STATE_PREFIX = "verify_claims_state_"
+    LOCK_SUFFIX = ".lock"
 
     def __init__(self, session_id: str):
         self.session_id = session_id
         self.state_file = self.STATE_DIR / f"{self.STATE_PREFIX}{session_id}.json"
         self._state = self._load_or_create()
+        self._dirty = False
+        self._rebuild_indexes()
+        self._batch_depth = 0
+
+    def __enter__(self) -> "SessionState":
+        self._batch_depth += 1
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._batch_depth -= 1
+        if self._batch_depth == 0:
+            self.flush()
 
     def _load_or_create(self) -> dict[str, Any]:
         """Load existing state or create new."""
-        if self.state_file.exists():
-            try:
-                with open(self.state_file) as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, OSError):
-                pass
+        try:
+            with open(self.state_file, 'rb') as f:
+                return jsonio.loads(f.read())
+        except (jsonio.JSONDecodeError, OSError):
+            pass
 
         return {
             "session_id": self.session_id,
@@ -53,25 +76,131 @@ class SessionState:
             "files_written": [],
             "commands_run": [],
             "verification_results": [],
-            "verification_count": 0,
-            "stop_hook_active": False
+            "verification_count": 0
+        }
+
+    def _rebuild_indexes(self) -> None:
+        """Build lookup indexes from the loaded state."""
+        self._files_written_abs = {
+            os.path.abspath(record["path"])
+            for record in self._state.get("files_written", [])
         }
+        self._last_exit_codes: dict[str, int | None] = {
+            "is_test": None,
+            "is_lint": None,
+            "is_build": None,
+        }
+        for cmd in self._state.get("commands_run", []):
+            self._index_command(cmd)
+
+    def _index_command(self, cmd: dict[str, Any]) -> None:
+        """Record a command's exit code as the latest for each kind it matches."""
+        for kind in self._last_exit_codes:
+            if cmd.get(kind):
+                self._last_exit_codes[kind] = cmd.get("exit_code")
+
+    def _last_passed(self, kind: str) -> bool | None:
+        """Check if the last command of a kind passed, or None if none ran."""
+        exit_code = self._last_exit_codes[kind]
+        return None if exit_code is None else exit_code == 0
 
     def _save(self) -> None:
-        """Save state to file."""
+        """Save state to file, or defer it until the current batch exits."""
+        self._dirty = True
+        if self._batch_depth == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending changes to the state file."""
+        if not self._dirty:
+            return
+
+        # Serialize first so an unencodable value never leaves a partial file
+        payload = jsonio.dumps(self._state)
+
         self.STATE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(self.state_file, 'w') as f:
-            json.dump(self._state, f, indent=2)
+        tmp_file = self.state_file.with_name(f"{self.state_file.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_file, self.state_file)
+        except OSError:
+            tmp_file.unlink(missing_ok=True)
+            raise
+        self._dirty = False
 
-    @property
-    def stop_hook_active(self) -> bool:
-        """Check if stop hook is currently active (prevents infinite loops)."""
-        return self._state.get("stop_hook_active", False)
+    @classmethod
+    def _stop_hook_lock_path(cls, session_id: str) -> Path:
+        return cls.STATE_DIR / f"{cls.STATE_PREFIX}{session_id}{cls.LOCK_SUFFIX}"
 
-    @stop_hook_active.setter
-    def stop_hook_active(self, value: bool) -> None:
-        self._state["stop_hook_active"] = value
-        self._save()
+    @classmethod
+    def acquire_stop_hook_lock(cls, session_id: str, stale_after: float = 300) -> bool:
+        """
+        Claim the session's stop hook lock without loading its state.
+
+        The lock is a file created with O_EXCL, so checking whether another
+        run is active costs a syscall or two rather than a state load. A lock
+        older than stale_after seconds is assumed to be left over from a run
+        that died, and is taken over.
+
+        Args:
+            session_id: Session identifier
+            stale_after: Age in seconds after which an existing lock is ignored
+
+        Returns:
+            True if the lock was acquired, False if another run holds it
+        """
+        lock_path = cls._stop_hook_lock_path(session_id)
+        flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+        try:
+            fd = os.open(lock_path, flags, 0o644)
+        except FileNotFoundError:
+            cls.STATE_DIR.mkdir(parents=True, exist_ok=True)
+            fd = os.open(lock_path, flags, 0o644)
+        except FileExistsError:
+            try:
+                age = time.time() - os.stat(lock_path).st_mtime
+            except FileNotFoundError:
+                # Released between the two calls
+                return cls.acquire_stop_hook_lock(session_id, stale_after)
+            if age < stale_after:
+                return False
+            return cls._take_over_stale_lock(lock_path, session_id, stale_after)
+        os.close(fd)
+        return True
+
+    @classmethod
+    def _take_over_stale_lock(cls, lock_path: Path, session_id: str,
+                              stale_after: float) -> bool:
+        """
+        Remove a stale lock and race for a fresh one with O_EXCL.
+
+        The stale lock is renamed aside rather than unlinked, so a run that
+        replaced it after our age check isn't deleted unseen: if the file
+        moved aside turns out to be fresh, it is put back and we back off.
+        """
+        aside = lock_path.with_name(f"{lock_path.name}.{os.getpid()}.stale")
+        try:
+            os.rename(lock_path, aside)
+        except FileNotFoundError:
+            # Another run moved or released it first
+            return cls.acquire_stop_hook_lock(session_id, stale_after)
+        try:
+            if time.time() - os.stat(aside).st_mtime < stale_after:
+                try:
+                    os.link(aside, lock_path)
+                except FileExistsError:
+                    pass
+                return False
+        finally:
+            aside.unlink(missing_ok=True)
+        # Only one run's O_EXCL create can succeed
+        return cls.acquire_stop_hook_lock(session_id, stale_after)
+
+    @classmethod
+    def release_stop_hook_lock(cls, session_id: str) -> None:
+        """Release the session's stop hook lock."""
+        cls._stop_hook_lock_path(session_id).unlink(missing_ok=True)
 
     @property
     def verification_count(self) -> int:
@@ -91,24 +220,39 @@ class SessionState:
             "tool": tool_name,
             "timestamp": time.time()
         })
+        self._files_written_abs.add(os.path.abspath(file_path))
         self._save()
 
     def add_command_run(self, command: str, exit_code: int, is_test: bool = False,
                         is_lint: bool = False, is_build: bool = False) -> None:
         """Track a command that was run."""
-        self._state["commands_run"].append({
+        record = {
             "command": command,
             "exit_code": exit_code,
             "is_test": is_test,
             "is_lint": is_lint,
             "is_build": is_build,
             "timestamp": time.time()
-        })
+        }
+        self._state["commands_run"].append(record)
+        self._index_command(record)
         self._save()
 
     def add_verification_result(self, result: VerificationResult) -> None:
         """Add a verification result."""
-        self._state["verification_results"].append(asdict(result))
+        self.add_verification_results([result])
+
+    def add_verification_results(self, results: Iterable[VerificationResult]) -> None:
+        """Add several verification results with a single state write."""
+        # Built directly rather than with asdict(), which deep-copies details
+        self._state["verification_results"].extend({
+            "claim_type": result.claim_type,
+            "claim_text": result.claim_text,
+            "passed": result.passed,
+            "message": result.message,
+            "timestamp": result.timestamp,
+            "details": result.details
+        } for result in results)
         self._save()
 
     def get_files_written(self) -> list[dict[str, Any]]:
@@ -121,50 +265,43 @@ class SessionState:
 
     def was_file_written(self, file_path: str) -> bool:
         """Check if a file was written during this session."""
-        abs_path = os.path.abspath(file_path)
-        for record in self._state.get("files_written", []):
-            if os.path.abspath(record["path"]) == abs_path:
-                return True
-        return False
+        return os.path.abspath(file_path) in self._files_written_abs
 
     def last_test_passed(self) -> bool | None:
         """Check if the last test command passed."""
-        for cmd in reversed(self._state.get("commands_run", [])):
-            if cmd.get("is_test"):
-                return cmd.get("exit_code") == 0
-        return None
+        return self._last_passed("is_test")
 
     def last_lint_passed(self) -> bool | None:
         """Check if the last lint command passed."""
-        for cmd in reversed(self._state.get("commands_run", [])):
-            if cmd.get("is_lint"):
-                return cmd.get("exit_code") == 0
-        return None
+        return self._last_passed("is_lint")
 
     def last_build_passed(self) -> bool | None:
         """Check if the last build command passed."""
-        for cmd in reversed(self._state.get("commands_run", [])):
-            if cmd.get("is_build"):
-                return cmd.get("exit_code") == 0
-        return None
+        return self._last_passed("is_build")
 
     @classmethod
     def cleanup_old_states(cls, max_age_days: int = 30) -> int:
-        """Remove state files older than max_age_days. Returns count removed."""
+        """Remove state and lock files older than max_age_days. Returns count removed."""
         removed = 0
         max_age_seconds = max_age_days * 24 * 60 * 60
         now = time.time()
 
-        if not cls.STATE_DIR.exists():
+        try:
+            entries = os.scandir(cls.STATE_DIR)
+        except OSError:
             return 0
 
-        for state_file in cls.STATE_DIR.glob(f"{cls.STATE_PREFIX}*.json"):
-            try:
-                mtime = state_file.stat().st_mtime
-                if now - mtime > max_age_seconds:
-                    state_file.unlink()
-                    removed += 1
-            except OSError:
-                pass
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith(cls.STATE_PREFIX)
+                        and name.endswith((".json", cls.LOCK_SUFFIX))):
+                    continue
+                try:
+                    if now - entry.stat().st_mtime > max_age_seconds:
+                        os.unlink(entry.path)
+                        removed += 1
+                except OSError:
+                    pass
 
         return removed
@@ -1,24 +1,51 @@
 """Verifiers for different claim types."""
 
+import importlib
+import os
+from collections.abc import Callable, Sequence
 from typing import Any
 
 from .base import VerificationResult
-from .build_checker import verify_build_success
-from .file_exists import verify_file_exists
-from .git_diff import verify_changes_made
-from .lint_checker import verify_lint_clean
-from .test_runner import verify_tests_pass
-
-# Map claim types to verifier functions
-VERIFIERS = {
-    "file_created": verify_file_exists,
-    "tests_pass": verify_tests_pass,
-    "lint_clean": verify_lint_clean,
-    "build_success": verify_build_success,
-    "bug_fixed": verify_changes_made,
+
+# Map claim types to the (module, function) of their verifier. Verifier
+# modules are only imported when a claim of that type is verified, so hooks
+# that never verify anything don't pay for them.
+_VERIFIER_LOCATIONS: dict[str, tuple[str, str]] = {
+    "file_created": (".file_exists", "verify_file_exists"),
+    "tests_pass": (".test_runner", "verify_tests_pass"),
+    "lint_clean": (".lint_checker", "verify_lint_clean"),
+    "build_success": (".build_checker", "verify_build_success"),
+    "bug_fixed": (".git_diff", "verify_changes_made"),
+}
+
+_LAZY_ATTRS: dict[str, str] = {
+    function_name: module_name for module_name, function_name in _VERIFIER_LOCATIONS.values()
 }
 
 
+def _get_verifier(claim_type: str) -> Callable[..., VerificationResult] | None:
+    """Import and return the verifier for a claim type, or None if there isn't one."""
+    location = _VERIFIER_LOCATIONS.get(claim_type)
+    if location is None:
+        return None
+    function_name = location[1]
+    return globals().get(function_name) or __getattr__(function_name)
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve verifier functions and VERIFIERS on first access (PEP 562)."""
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+    elif name == "VERIFIERS":
+        value = {claim_type: _get_verifier(claim_type) for claim_type in _VERIFIER_LOCATIONS}
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
 def verify_claim(claim_type: str, claim_value: str | None,
                  cwd: str, config: dict[str, Any]) -> VerificationResult:
     """
@@ -33,7 +60,7 @@ def verify_claim(claim_type: str, claim_value: str | None,
     Returns:
         VerificationResult with pass/fail status and details
     """
-    verifier = VERIFIERS.get(claim_type)
+    verifier = _get_verifier(claim_type)
 
     if verifier is None:
         return VerificationResult(
@@ -61,10 +88,47 @@ def verify_claim(claim_type: str, claim_value: str | None,
         )
 
 
+def verify_claims_concurrently(claims: Sequence[tuple[str, str | None]], cwd: str,
+                               config: dict[str, Any]) -> list[VerificationResult]:
+    """
+    Verify several claims at once, running their verifiers in parallel.
+
+    Verifiers spend nearly all their time waiting on subprocesses (builds,
+    linters, test suites, git), so running them on threads lets the total
+    time approach that of the slowest one.
+
+    Args:
+        claims: (claim_type, claim_value) pairs to verify
+        cwd: Current working directory
+        config: Plugin configuration; behavior.parallel_verify set to false
+            runs the verifiers one at a time
+
+    Returns:
+        VerificationResults in the same order as claims
+    """
+    # Builds, linters and test suites are CPU-heavy themselves, so running
+    # more of them at once than there are CPUs only makes them thrash
+    workers = min(len(claims), os.cpu_count() or 1)
+    if workers <= 1 or not config.get("behavior", {}).get("parallel_verify", True):
+        return [verify_claim(claim_type, claim_value, cwd, config)
+                for claim_type, claim_value in claims]
+
+    # Only needed with several claims; importing it costs more than most hooks
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(verify_claim, claim_type, claim_value, cwd, config)
+            for claim_type, claim_value in claims
+        ]
+        return [future.result() for future in futures]
+
+
 __all__ = [
     'VerificationResult',
     'VERIFIERS',
     'verify_claim',
+    'verify_claims_concurrently',
     'verify_file_exists',
     'verify_tests_pass',
     'verify_lint_clean',
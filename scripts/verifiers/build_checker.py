@@ -5,10 +5,15 @@ import subprocess
 from typing import Any
 
 from .base import VerificationResult
-from .command_detection import file_exists, read_package_json
+from .command_detection import cached_detection, get_npm_scripts, project_files
+from .command_runner import run_command, split_command
+from .result_cache import run_cached
 
+_GRADLE_FILES = frozenset({"build.gradle", "build.gradle.kts"})
 
-def detect_build_command(cwd: str) -> tuple[str, str] | None:
+
+@cached_detection
+def detect_build_command(cwd: str) -> tuple[tuple[str, ...], str] | None:
     """
     Detect the appropriate build command for the project.
 
@@ -16,44 +21,45 @@ def detect_build_command(cwd: str) -> tuple[str, str] | None:
         cwd: Current working directory
 
     Returns:
-        Tuple of (command, build_tool_name) or None if not detected
+        Tuple of (command argv, build_tool_name) or None if not detected
     """
+    names = project_files(cwd)
+
     # Node.js/npm projects
-    pkg = read_package_json(cwd)
-    if pkg:
-        scripts = pkg.get("scripts", {})
+    scripts = get_npm_scripts(cwd)
+    if scripts is not None:
         if "build" in scripts:
-            return ("npm run build", "npm")
+            return (("npm", "run", "build"), "npm")
         if "compile" in scripts:
-            return ("npm run compile", "npm")
+            return (("npm", "run", "compile"), "npm")
 
     # TypeScript projects
-    if file_exists(cwd, "tsconfig.json"):
-        return ("npx tsc --noEmit", "typescript")
+    if "tsconfig.json" in names:
+        return (("npx", "tsc", "--noEmit"), "typescript")
 
     # Rust projects
-    if file_exists(cwd, "Cargo.toml"):
-        return ("cargo build", "cargo")
+    if "Cargo.toml" in names:
+        return (("cargo", "build"), "cargo")
 
     # Go projects
-    if file_exists(cwd, "go.mod"):
-        return ("go build ./...", "go")
+    if "go.mod" in names:
+        return (("go", "build", "./..."), "go")
 
     # Java/Maven projects
-    if file_exists(cwd, "pom.xml"):
-        return ("mvn compile", "maven")
+    if "pom.xml" in names:
+        return (("mvn", "compile"), "maven")
 
     # Java/Gradle projects
-    if file_exists(cwd, "build.gradle", "build.gradle.kts"):
-        return ("./gradlew build", "gradle")
+    if names & _GRADLE_FILES:
+        return (("./gradlew", "build"), "gradle")
 
     # Make projects
-    if file_exists(cwd, "Makefile"):
-        return ("make", "make")
+    if "Makefile" in names:
+        return (("make",), "make")
 
     # CMake projects
-    if file_exists(cwd, "CMakeLists.txt"):
-        return ("cmake --build .", "cmake")
+    if "CMakeLists.txt" in names:
+        return (("cmake", "--build", "."), "cmake")
 
     return None
 
@@ -77,6 +83,7 @@ def verify_build_success(claim_value: str | None, cwd: str,
     # Use custom command if specified
     if custom_command:
         build_command = custom_command
+        argv = split_command(custom_command)
         build_tool = "custom"
     else:
         # Auto-detect build command
@@ -87,62 +94,58 @@ def verify_build_success(claim_value: str | None, cwd: str,
                 message="No build system detected, skipping verification",
                 details={"skipped": True, "reason": "no_build_system"}
             )
-        build_command, build_tool = detected
-
-    try:
-        result = subprocess.run(
-            shlex.split(build_command),
-            shell=False,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-
-        if result.returncode == 0:
+        argv, build_tool = detected
+        build_command = shlex.join(argv)
+
+    def run() -> VerificationResult:
+        try:
+            result = run_command(argv, cwd, timeout, tail_bytes=1500)
+
+            if result.returncode == 0:
+                return VerificationResult(
+                    passed=True,
+                    message=f"Build succeeded ({build_tool})",
+                    details={
+                        "command": build_command,
+                        "build_tool": build_tool,
+                        "exit_code": result.returncode
+                    }
+                )
+            else:
+                # Extract build errors
+                output_tail = result.output_tail or "No output"
+
+                return VerificationResult(
+                    passed=False,
+                    message=f"Build failed ({build_tool})",
+                    details={
+                        "command": build_command,
+                        "build_tool": build_tool,
+                        "exit_code": result.returncode,
+                        "output_tail": output_tail
+                    }
+                )
+
+        except subprocess.TimeoutExpired:
             return VerificationResult(
-                passed=True,
-                message=f"Build succeeded ({build_tool})",
+                passed=False,
+                message=f"Build timed out after {timeout}s",
                 details={
                     "command": build_command,
                     "build_tool": build_tool,
-                    "exit_code": result.returncode
+                    "timeout": timeout,
+                    "error": "timeout"
                 }
             )
-        else:
-            # Extract build errors
-            output = result.stdout + result.stderr
-            output_tail = output[-1500:] if output else "No output"
-
+        except Exception as e:
             return VerificationResult(
                 passed=False,
-                message=f"Build failed ({build_tool})",
+                message=f"Failed to run build: {str(e)}",
                 details={
                     "command": build_command,
                     "build_tool": build_tool,
-                    "exit_code": result.returncode,
-                    "output_tail": output_tail
+                    "error": str(e)
                 }
             )
 
-    except subprocess.TimeoutExpired:
-        return VerificationResult(
-            passed=False,
-            message=f"Build timed out after {timeout}s",
-            details={
-                "command": build_command,
-                "build_tool": build_tool,
-                "timeout": timeout,
-                "error": "timeout"
-            }
-        )
-    except Exception as e:
-        return VerificationResult(
-            passed=False,
-            message=f"Failed to run build: {str(e)}",
-            details={
-                "command": build_command,
-                "build_tool": build_tool,
-                "error": str(e)
-            }
-        )
+    return run_cached("build", argv, cwd, config, run)
@@ -1,10 +1,82 @@
 """Shared command detection utilities for verifiers."""
 
-import json
+import functools
 import os
-from typing import Any
+import re
+from collections.abc import Callable
+from typing import Any, TypeVar
 
+from utils import jsonio
 
+_T = TypeVar("_T")
+
+# Detection results keyed by (function, cwd, args), stored with the
+# signature of the project they were computed from
+_DETECTION_CACHE: dict[tuple[Any, ...], tuple[tuple[Any, ...], Any]] = {}
+
+# Files whose contents (not just presence) detection depends on
+_CONTENT_MARKERS = ("package.json", "pyproject.toml")
+
+
+def _project_signature(cwd: str) -> tuple[Any, ...]:
+    """
+    Get a cheap fingerprint of the files detection looks at.
+
+    Adding or removing a marker file changes the directory's mtime; editing
+    package.json or pyproject.toml in place does not, so those are stat'ed too.
+    """
+    signature = []
+    for path in (cwd, *(os.path.join(cwd, name) for name in _CONTENT_MARKERS)):
+        try:
+            st = os.stat(path)
+            signature.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def cached_detection(func: Callable[..., _T]) -> Callable[..., _T]:
+    """
+    Cache a detection function of (cwd, *args) until the project changes.
+
+    Cached values are shared between callers and must not be mutated.
+    """
+    @functools.wraps(func)
+    def wrapper(cwd: str, *args: Any) -> _T:
+        key = (func, cwd, args)
+        signature = _project_signature(cwd)
+        cached = _DETECTION_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        value = func(cwd, *args)
+        _DETECTION_CACHE[key] = (signature, value)
+        return value
+
+    return wrapper
+
+
+def clear_detection_cache() -> None:
+    """Forget all cached detection results."""
+    _DETECTION_CACHE.clear()
+
+
+@cached_detection
+def _read_content_marker(cwd: str, name: str) -> bytes | None:
+    """
+    Read one of the _CONTENT_MARKERS files, sharing the bytes between callers.
+
+    The cache signature covers exactly these files, so a read is reused
+    until the file changes and never outlives an edit.
+    """
+    try:
+        with open(os.path.join(cwd, name), 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+@cached_detection
 def read_package_json(cwd: str) -> dict[str, Any] | None:
     """
     Read and parse package.json if it exists.
@@ -15,16 +87,37 @@ def read_package_json(cwd: str) -> dict[str, Any] | None:
     Returns:
         Parsed package.json contents or None
     """
-    pkg_json = os.path.join(cwd, "package.json")
-    if os.path.exists(pkg_json):
-        try:
-            with open(pkg_json) as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError):
-            pass
-    return None
+    data = _read_content_marker(cwd, "package.json")
+    if data is None:
+        return None
+    try:
+        return jsonio.loads(data)
+    except ValueError:
+        # Covers malformed JSON and invalid UTF-8
+        return None
+
+
+@cached_detection
+def get_npm_scripts(cwd: str) -> frozenset[str] | None:
+    """
+    Get the names of the scripts defined in package.json.
 
+    Args:
+        cwd: Current working directory
 
+    Returns:
+        Script names, or None if package.json is missing, unparseable or
+        not a non-empty object
+    """
+    # Shares read_package_json's cached parse
+    pkg = read_package_json(cwd)
+    if not pkg or not isinstance(pkg, dict):
+        return None
+    scripts = pkg.get("scripts")
+    return frozenset(scripts) if isinstance(scripts, dict) else frozenset()
+
+
+@cached_detection
 def read_pyproject_toml(cwd: str) -> str | None:
     """
     Read pyproject.toml contents if it exists.
@@ -35,28 +128,152 @@ def read_pyproject_toml(cwd: str) -> str | None:
     Returns:
         File contents as string or None
     """
-    pyproject = os.path.join(cwd, "pyproject.toml")
-    if os.path.exists(pyproject):
+    data = _read_content_marker(cwd, "pyproject.toml")
+    if data is None:
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+@cached_detection
+def pyproject_mentions(cwd: str, text: str) -> bool:
+    """
+    Check whether pyproject.toml contains some text anywhere.
+
+    The answer is cached until the file changes, so repeated detection
+    doesn't rescan the file.
+
+    Args:
+        cwd: Current working directory
+        text: Text to look for (e.g. "pytest")
+
+    Returns:
+        True if pyproject.toml exists and contains the text
+    """
+    content = read_pyproject_toml(cwd)
+    return content is not None and text in content
+
+
+@cached_detection
+def project_entries(cwd: str) -> dict[str, os.DirEntry]:
+    """
+    Scan the top level of the project once, keeping the directory entries.
+
+    DirEntry objects carry the file type from the directory listing and
+    cache their stat results, so checks against them need no further
+    syscalls in the common case.
+
+    Args:
+        cwd: Current working directory
+
+    Returns:
+        Entries in cwd keyed by name (empty if it can't be read)
+    """
+    try:
+        with os.scandir(cwd) as entries:
+            return {entry.name: entry for entry in entries}
+    except OSError:
+        return {}
+
+
+@cached_detection
+def project_files(cwd: str) -> frozenset[str]:
+    """
+    List the names of the entries at the top level of the project.
+
+    Args:
+        cwd: Current working directory
+
+    Returns:
+        Names of files and directories in cwd (empty if it can't be read)
+    """
+    return frozenset(project_entries(cwd))
+
+
+@functools.lru_cache(maxsize=1)
+def _tomllib() -> Any:
+    """Import tomllib on first use, returning None on Python 3.10."""
+    try:
+        import tomllib
+    except ImportError:
+        return None
+    return tomllib
+
+
+def has_subdirectory(cwd: str, name: str) -> bool:
+    """
+    Check whether the project has a top-level directory with the given name.
+
+    Args:
+        cwd: Current working directory
+        name: Directory name (e.g. "tests")
+
+    Returns:
+        True if the entry exists and is a directory (or a link to one)
+    """
+    entry = project_entries(cwd).get(name)
+    if entry is None:
+        return False
+    try:
+        # Answered from the directory listing unless the entry is a symlink
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+# Fallback for when tomllib is unavailable or the file doesn't parse:
+# [tool.X] / [tool.X.Y] table headers at the start of a line
+_TOOL_TABLE_RE = re.compile(r'^\s*\[\s*tool\.([A-Za-z0-9_-]+)', re.MULTILINE)
+
+
+@cached_detection
+def get_pyproject_tools(cwd: str) -> frozenset[str]:
+    """
+    Get the names of the [tool.*] tables configured in pyproject.toml.
+
+    Args:
+        cwd: Current working directory
+
+    Returns:
+        Tool names (e.g. "ruff", "pytest"), empty if there is no pyproject.toml
+    """
+    content = read_pyproject_toml(cwd)
+    if content is None:
+        return frozenset()
+
+    tomllib = _tomllib()
+    if tomllib is not None:
         try:
-            with open(pyproject) as f:
-                return f.read()
-        except OSError:
+            tools = tomllib.loads(content).get("tool", {})
+            if isinstance(tools, dict):
+                return frozenset(tools)
+            return frozenset()
+        except tomllib.TOMLDecodeError:
             pass
-    return None
 
+    return frozenset(_TOOL_TABLE_RE.findall(content))
 
-def file_exists(cwd: str, *paths: str) -> bool:
+
+def file_exists(cwd: str, *paths: str,
+                entries: dict[str, os.DirEntry] | None = None) -> bool:
     """
     Check if any of the given paths exist.
 
     Args:
         cwd: Current working directory
         paths: Relative paths to check
+        entries: Result of project_entries(cwd); top-level paths are then
+            looked up in it instead of being stat'ed (broken symlinks count
+            as existing)
 
     Returns:
         True if any path exists
     """
-    return any(os.path.exists(os.path.join(cwd, p)) for p in paths)
+    if entries is None:
+        return any(os.path.exists(os.path.join(cwd, p)) for p in paths)
+    return any(
+        p in entries if "/" not in p else os.path.exists(os.path.join(cwd, p))
+        for p in paths
+    )
 
 
 def detect_npm_script(cwd: str, *script_names: str) -> tuple[str, str] | None:
@@ -70,9 +287,8 @@ def detect_npm_script(cwd: str, *script_names: str) -> tuple[str, str] | None:
     Returns:
         Tuple of (npm command, "npm") or None
     """
-    pkg = read_package_json(cwd)
-    if pkg:
-        scripts = pkg.get("scripts", {})
+    scripts = get_npm_scripts(cwd)
+    if scripts:
         for name in script_names:
             if name in scripts:
                 if name == "test" or name == "lint" or name == "build":
@@ -82,20 +298,21 @@ def detect_npm_script(cwd: str, *script_names: str) -> tuple[str, str] | None:
 
 
 # Common project file detectors
-PROJECT_MARKERS = {
-    "npm": ["package.json"],
-    "python": ["pyproject.toml", "setup.py", "pytest.ini"],
-    "rust": ["Cargo.toml"],
-    "go": ["go.mod"],
-    "ruby": ["Gemfile"],
-    "java_maven": ["pom.xml"],
-    "java_gradle": ["build.gradle", "build.gradle.kts"],
-    "make": ["Makefile"],
-    "cmake": ["CMakeLists.txt"],
-    "typescript": ["tsconfig.json"],
+PROJECT_MARKERS: dict[str, frozenset[str]] = {
+    "npm": frozenset({"package.json"}),
+    "python": frozenset({"pyproject.toml", "setup.py", "pytest.ini"}),
+    "rust": frozenset({"Cargo.toml"}),
+    "go": frozenset({"go.mod"}),
+    "ruby": frozenset({"Gemfile"}),
+    "java_maven": frozenset({"pom.xml"}),
+    "java_gradle": frozenset({"build.gradle", "build.gradle.kts"}),
+    "make": frozenset({"Makefile"}),
+    "cmake": frozenset({"CMakeLists.txt"}),
+    "typescript": frozenset({"tsconfig.json"}),
 }
 
 
+@cached_detection
 def detect_project_type(cwd: str) -> list[str]:
     """
     Detect project types based on marker files.
@@ -106,8 +323,10 @@ def detect_project_type(cwd: str) -> list[str]:
     Returns:
         List of detected project types
     """
-    detected = []
-    for project_type, markers in PROJECT_MARKERS.items():
-        if file_exists(cwd, *markers):
-            detected.append(project_type)
-    return detected
+    # All markers are top-level names, so one directory listing answers them
+    names = project_files(cwd)
+    return [
+        project_type
+        for project_type, markers in PROJECT_MARKERS.items()
+        if names & markers
+    ]
@@ -0,0 +1,200 @@
+"""Run verification commands while keeping only the tail of their output."""
+
+import os
+import shlex
+import shutil
+import signal
+import subprocess
+import threading
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import IO
+
+_READ_SIZE = 65536
+
+
+@dataclass
+class CommandResult:
+    """Exit status and trailing output of a finished command."""
+    returncode: int
+    output_tail: str
+    stopped_early: bool = False
+
+
+@lru_cache(maxsize=32)
+def split_command(command: str) -> tuple[str, ...]:
+    """
+    Split a configured command string into argv, caching the result.
+
+    Args:
+        command: Command line as written in the config
+
+    Returns:
+        Tuple of command arguments
+    """
+    return tuple(shlex.split(command))
+
+
+@lru_cache(maxsize=1)
+def _git_executable() -> str:
+    """Resolve git to an absolute path, falling back to a PATH lookup at exec time."""
+    return shutil.which("git") or "git"
+
+
+def run_git(args: Sequence[str], cwd: str, timeout: float = 10,
+            text: bool = True) -> subprocess.CompletedProcess:
+    """
+    Run a short git command and capture its output.
+
+    The repository is passed with `git -C` rather than as the child's working
+    directory, git is invoked by absolute path and descriptors aren't closed,
+    which together let subprocess start git with posix_spawn instead of
+    fork+exec.
+
+    Args:
+        args: Git subcommand and arguments (without the leading "git")
+        cwd: Repository directory
+        timeout: Seconds to wait before giving up
+        text: Decode output as text instead of returning bytes
+
+    Returns:
+        CompletedProcess with captured stdout and stderr
+
+    Raises:
+        subprocess.TimeoutExpired: If git didn't finish in time
+        OSError: If git couldn't be started
+    """
+    return subprocess.run(
+        [_git_executable(), "-C", cwd, *args],
+        capture_output=True,
+        text=text,
+        timeout=timeout,
+        close_fds=False
+    )
+
+
+def _drain(stream: IO[bytes], tail: deque[bytes], tail_bytes: int,
+           fail_markers: Sequence[bytes] = (),
+           on_marker: Callable[[], None] | None = None) -> None:
+    """
+    Read a stream to EOF, keeping at least the last tail_bytes bytes.
+
+    If any of fail_markers shows up in the output, on_marker is called once.
+    """
+    kept = 0
+    # Bytes carried over from the previous chunk, so markers split across
+    # two reads are still found
+    overlap = max((len(marker) for marker in fail_markers), default=1) - 1
+    carry = b""
+    while True:
+        chunk = stream.read1(_READ_SIZE)
+        if not chunk:
+            break
+        tail.append(chunk)
+        kept += len(chunk)
+        # Drop whole chunks once the rest still covers the tail
+        while kept - len(tail[0]) >= tail_bytes:
+            kept -= len(tail.popleft())
+
+        if fail_markers:
+            boundary = carry + chunk[:overlap]
+            if any(marker in chunk or marker in boundary for marker in fail_markers):
+                fail_markers = ()
+                on_marker()
+            elif overlap:
+                carry = boundary[-overlap:] if len(chunk) < overlap else chunk[-overlap:]
+
+
+def _join_tail(chunks: Sequence[bytes], tail_bytes: int) -> bytes:
+    """Join just the last tail_bytes bytes of a list of chunks."""
+    pieces = []
+    needed = tail_bytes
+    for chunk in reversed(chunks):
+        if needed <= 0:
+            break
+        # Slicing a memoryview doesn't copy; only the final join does
+        pieces.append(memoryview(chunk)[-needed:])
+        needed -= len(chunk)
+    return b"".join(reversed(pieces))
+
+
+def _kill_process_group(proc: subprocess.Popen) -> None:
+    """Kill a command started in its own session, along with its children."""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        # Everything in the group has already exited
+        pass
+
+
+def run_command(argv: Sequence[str], cwd: str, timeout: float,
+                tail_bytes: int = 1500,
+                fail_markers: Sequence[bytes] = ()) -> CommandResult:
+    """
+    Run a command with stderr merged into stdout, keeping only its output tail.
+
+    Output is streamed through a small buffer instead of being captured in
+    full, so a verbose build uses O(tail_bytes) memory however much it prints.
+    The command gets its own process group, so stopping it also stops the
+    processes it started (e.g. the jest workers behind `npm test`).
+
+    Args:
+        argv: Command and arguments (run without a shell)
+        cwd: Working directory for the command
+        timeout: Seconds to wait before killing the command
+        tail_bytes: Number of trailing output bytes to keep
+        fail_markers: Output that means the command has already failed; the
+            command is killed as soon as one of them is printed
+
+    Returns:
+        CommandResult with the exit code and decoded output tail, and
+        stopped_early set if a fail marker cut the command short
+
+    Raises:
+        subprocess.TimeoutExpired: If the command didn't finish in time
+        OSError: If the command couldn't be started
+    """
+    proc = subprocess.Popen(
+        list(argv),
+        cwd=cwd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        start_new_session=True,
+    )
+    tail: deque[bytes] = deque()
+    stopped = threading.Event()
+
+    def stop() -> None:
+        stopped.set()
+        _kill_process_group(proc)
+
+    reader = threading.Thread(
+        target=_drain,
+        args=(proc.stdout, tail, tail_bytes, fail_markers, stop),
+        daemon=True
+    )
+    reader.start()
+
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _kill_process_group(proc)
+        proc.wait()
+        raise
+    finally:
+        # A background process that inherited the pipe can keep it open
+        # after the command exits, so don't wait on the reader forever
+        reader.join(timeout=1)
+        if not reader.is_alive():
+            proc.stdout.close()
+
+    # Copy first in case the reader is still appending
+    output = _join_tail(tail.copy(), tail_bytes)
+    return CommandResult(
+        returncode,
+        output.decode("utf-8", errors="replace"),
+        stopped_early=stopped.is_set()
+    )
@@ -1,6 +1,7 @@
 """Verify file creation claims."""
 
 import os
+import stat
 from typing import Any
 
 from .base import VerificationResult
@@ -35,33 +36,15 @@ def verify_file_exists(file_path: str | None, cwd: str,
     # Normalize the path
     full_path = os.path.normpath(full_path)
 
-    if os.path.exists(full_path):
-        # Check if it's a file (not a directory)
-        if os.path.isfile(full_path):
-            # Get file size for additional verification
-            size = os.path.getsize(full_path)
-            return VerificationResult(
-                passed=True,
-                message=f"File exists: {file_path}",
-                details={
-                    "path": full_path,
-                    "size": size,
-                    "is_file": True
-                }
-            )
-        else:
-            return VerificationResult(
-                passed=False,
-                message=f"Path exists but is not a file: {file_path}",
-                details={
-                    "path": full_path,
-                    "is_directory": os.path.isdir(full_path)
-                }
-            )
-    else:
+    # One stat call gives both the file type and size
+    try:
+        st = os.stat(full_path)
+    except (OSError, ValueError):
+        # Anything os.path.exists would report as missing, including
+        # permission errors, overlong names and embedded null bytes.
         # Check if parent directory exists (helps diagnose issues)
         parent = os.path.dirname(full_path)
-        parent_exists = os.path.exists(parent)
+        parent_exists = os.path.isdir(parent)
 
         return VerificationResult(
             passed=False,
@@ -72,3 +55,24 @@ def verify_file_exists(file_path: str | None, cwd: str,
                 "cwd": cwd
             }
         )
+
+    # Check if it's a file (not a directory)
+    if stat.S_ISREG(st.st_mode):
+        return VerificationResult(
+            passed=True,
+            message=f"File exists: {file_path}",
+            details={
+                "path": full_path,
+                "size": st.st_size,
+                "is_file": True
+            }
+        )
+
+    return VerificationResult(
+        passed=False,
+        message=f"Path exists but is not a file: {file_path}",
+        details={
+            "path": full_path,
+            "is_directory": stat.S_ISDIR(st.st_mode)
+        }
+    )
@@ -5,6 +5,124 @@ import subprocess
 from typing import Any
 
 from .base import VerificationResult
+from .command_runner import run_git
+
+# Extensions (without the dot) of files counted as code changes
+_CODE_EXTS = frozenset({
+    "py", "js", "ts", "tsx", "jsx", "rs", "go", "java", "c", "cpp", "h", "hpp",
+    "rb", "php", "swift", "kt", "scala", "vue", "svelte"
+})
+
+
+def is_code_file(path: str) -> bool:
+    """
+    Check whether a changed file looks like source code.
+
+    Args:
+        path: File path as reported by git
+
+    Returns:
+        True if the file's extension is a known code extension
+    """
+    _, dot, ext = path.rpartition(".")
+    return bool(dot) and ext.lower() in _CODE_EXTS
+
+
+def _decode_path(path: bytes) -> str:
+    """Decode a path from -z output, which git leaves unquoted."""
+    return path.decode("utf-8", errors="replace")
+
+
+def parse_status(output: bytes) -> tuple[list[str], list[str], list[str]]:
+    """
+    Split `git status --porcelain=v2 -z` output into changed file lists.
+
+    With -z git doesn't quote paths, so they are decoded here, replacing
+    bytes that aren't UTF-8 rather than failing on them.
+
+    Args:
+        output: Raw output of the status command
+
+    Returns:
+        Tuple of (staged files, unstaged files, untracked files)
+    """
+    staged: list[str] = []
+    unstaged: list[str] = []
+    untracked: list[str] = []
+
+    records = iter(output.split(b"\0"))
+    for record in records:
+        kind = record[:1]
+        if kind == b"1":
+            fields = record.split(b" ", 8)
+        elif kind == b"2":
+            fields = record.split(b" ", 9)
+            # Renames and copies are followed by the original path
+            next(records, None)
+        elif kind == b"u":
+            # Unmerged paths show up in both the index and work tree diffs
+            path = _decode_path(record.split(b" ", 10)[10])
+            staged.append(path)
+            unstaged.append(path)
+            continue
+        elif kind == b"?":
+            untracked.append(_decode_path(record[2:]))
+            continue
+        else:
+            continue
+
+        # XY: index status then work tree status, "." for unchanged
+        xy, path = fields[1], _decode_path(fields[-1])
+        if xy[:1] != b".":
+            staged.append(path)
+        if xy[1:2] != b".":
+            unstaged.append(path)
+
+    return staged, unstaged, untracked
+
+
+def git_status(cwd: str) -> tuple[list[str], list[str], list[str]] | None:
+    """
+    List the changed files in a repository with a single status call.
+
+    Args:
+        cwd: Repository directory
+
+    Returns:
+        Tuple of (staged files, unstaged files, untracked files), or None
+        if git exited with an error
+
+    Raises:
+        subprocess.TimeoutExpired: If git didn't finish in time
+        OSError: If git couldn't be started
+    """
+    result = run_git(
+        ["status", "--porcelain=v2", "--untracked-files=all", "-z"], cwd, text=False
+    )
+    if result.returncode != 0:
+        return None
+    return parse_status(result.stdout)
+
+
+def list_changed_files(cwd: str) -> list[str] | None:
+    """
+    List files that differ from HEAD, including untracked ones.
+
+    Args:
+        cwd: Repository directory
+
+    Returns:
+        Paths relative to the repository root, or None if git failed
+    """
+    try:
+        status = git_status(cwd)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if status is None:
+        return None
+
+    staged, unstaged, untracked = status
+    return list(dict.fromkeys(staged + unstaged + untracked))
 
 
 def verify_changes_made(claim_value: str | None, cwd: str,
@@ -32,61 +150,33 @@ def verify_changes_made(claim_value: str | None, cwd: str,
         )
 
     try:
-        # Check for staged changes
-        staged_result = subprocess.run(
-            ["git", "diff", "--cached", "--name-only"],
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        staged_files = [f for f in staged_result.stdout.strip().split('\n') if f]
-
-        # Check for unstaged changes
-        unstaged_result = subprocess.run(
-            ["git", "diff", "--name-only"],
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        unstaged_files = [f for f in unstaged_result.stdout.strip().split('\n') if f]
-
-        # Check for untracked files (new files)
-        untracked_result = subprocess.run(
-            ["git", "ls-files", "--others", "--exclude-standard"],
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        untracked_files = [f for f in untracked_result.stdout.strip().split('\n') if f]
+        # One status call lists staged, unstaged and untracked files
+        status = git_status(cwd)
+        if status is None:
+            return VerificationResult(
+                passed=True,
+                message="Git status failed, skipping change verification",
+                details={"skipped": True, "reason": "git_error"}
+            )
+        staged_files, unstaged_files, untracked_files = status
 
         # Filter to code files only
-        code_extensions = {'.py', '.js', '.ts', '.tsx', '.jsx', '.rs', '.go',
-                          '.java', '.c', '.cpp', '.h', '.hpp', '.rb', '.php',
-                          '.swift', '.kt', '.scala', '.vue', '.svelte'}
-
-        def is_code_file(f):
-            _, ext = os.path.splitext(f)
-            return ext.lower() in code_extensions
-
         code_staged = [f for f in staged_files if is_code_file(f)]
         code_unstaged = [f for f in unstaged_files if is_code_file(f)]
         code_untracked = [f for f in untracked_files if is_code_file(f)]
 
-        all_code_changes = code_staged + code_unstaged + code_untracked
+        code_changes = len(code_staged) + len(code_unstaged) + len(code_untracked)
         total_changes = len(staged_files) + len(unstaged_files) + len(untracked_files)
 
-        if all_code_changes:
+        if code_changes:
             return VerificationResult(
                 passed=True,
-                message=f"Code changes detected: {len(all_code_changes)} file(s)",
+                message=f"Code changes detected: {code_changes} file(s)",
                 details={
                     "staged_files": code_staged,
                     "unstaged_files": code_unstaged,
                     "new_files": code_untracked,
-                    "total_code_changes": len(all_code_changes)
+                    "total_code_changes": code_changes
                 }
             )
         elif total_changes > 0:
@@ -103,12 +193,8 @@ def verify_changes_made(claim_value: str | None, cwd: str,
             )
         else:
             # Check if there are recent commits
-            log_result = subprocess.run(
-                ["git", "log", "-1", "--format=%H", "--since=5 minutes ago"],
-                cwd=cwd,
-                capture_output=True,
-                text=True,
-                timeout=10
+            log_result = run_git(
+                ["log", "-1", "--format=%H", "--since=5 minutes ago"], cwd
             )
 
             if log_result.stdout.strip():
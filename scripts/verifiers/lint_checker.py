@@ -1,18 +1,27 @@
 """Verify lint clean claims by running linters."""
 
+import os
 import shlex
 import subprocess
 from typing import Any
 
 from .base import VerificationResult
 from .command_detection import (
-    file_exists,
-    read_package_json,
-    read_pyproject_toml,
+    cached_detection,
+    get_npm_scripts,
+    get_pyproject_tools,
+    project_files,
 )
+from .command_runner import run_command, split_command
+from .git_diff import list_changed_files
+from .result_cache import run_cached
 
+_ESLINT_CONFIGS = frozenset({".eslintrc.js", ".eslintrc.json", "eslint.config.js"})
+_RUFF_CONFIGS = frozenset({"ruff.toml", ".ruff.toml"})
 
-def detect_lint_command(cwd: str) -> tuple[str, str] | None:
+
+@cached_detection
+def detect_lint_command(cwd: str) -> tuple[tuple[str, ...], str] | None:
     """
     Detect the appropriate lint command for the project.
 
@@ -20,47 +29,68 @@ def detect_lint_command(cwd: str) -> tuple[str, str] | None:
         cwd: Current working directory
 
     Returns:
-        Tuple of (command, linter_name) or None if not detected
+        Tuple of (command argv, linter_name) or None if not detected
     """
+    names = project_files(cwd)
+
     # Node.js/npm projects
-    pkg = read_package_json(cwd)
-    if pkg:
-        scripts = pkg.get("scripts", {})
+    scripts = get_npm_scripts(cwd)
+    if scripts is not None:
         if "lint" in scripts:
-            return ("npm run lint", "npm")
+            return (("npm", "run", "lint"), "npm")
         # Check for eslint config
-        if file_exists(cwd, ".eslintrc.js", ".eslintrc.json", "eslint.config.js"):
-            return ("npx eslint .", "eslint")
+        if names & _ESLINT_CONFIGS:
+            return (("npx", "eslint", "."), "eslint")
 
     # Python projects with ruff
-    if file_exists(cwd, "ruff.toml", ".ruff.toml"):
-        return ("ruff check .", "ruff")
+    if names & _RUFF_CONFIGS:
+        return (("ruff", "check", "."), "ruff")
 
     # Python projects - check pyproject.toml for tools
-    content = read_pyproject_toml(cwd)
-    if content:
-        if "[tool.ruff" in content:
-            return ("ruff check .", "ruff")
-        if "[tool.flake8" in content or "[tool.pylint" in content:
-            return ("flake8 .", "flake8")
+    tools = get_pyproject_tools(cwd)
+    if "ruff" in tools:
+        return (("ruff", "check", "."), "ruff")
+    if "flake8" in tools or "pylint" in tools:
+        return (("flake8", "."), "flake8")
 
     # Python with pylint or flake8 config
-    if file_exists(cwd, ".pylintrc"):
-        return ("pylint **/*.py", "pylint")
-    if file_exists(cwd, ".flake8"):
-        return ("flake8", "flake8")
+    if ".pylintrc" in names:
+        return (("pylint", "**/*.py"), "pylint")
+    if ".flake8" in names:
+        return (("flake8",), "flake8")
 
     # Rust projects
-    if file_exists(cwd, "Cargo.toml"):
-        return ("cargo clippy -- -D warnings", "clippy")
+    if "Cargo.toml" in names:
+        return (("cargo", "clippy", "--", "-D", "warnings"), "clippy")
 
     # Go projects
-    if file_exists(cwd, "go.mod"):
-        return ("golangci-lint run", "golangci-lint")
+    if "go.mod" in names:
+        return (("golangci-lint", "run"), "golangci-lint")
 
     return None
 
 
+def changed_python_files(cwd: str) -> list[str]:
+    """
+    Get the Python files changed in a repository rooted at cwd.
+
+    Args:
+        cwd: Current working directory
+
+    Returns:
+        Changed or untracked Python files that still exist, or an empty
+        list if there are none or cwd isn't the root of a git work tree
+    """
+    # git reports paths relative to the repository root
+    if ".git" not in project_files(cwd):
+        return []
+
+    return [
+        path for path in list_changed_files(cwd) or ()
+        if path.endswith((".py", ".pyi")) and os.path.isfile(os.path.join(cwd, path))
+    ]
+
+
 def verify_lint_clean(claim_value: str | None, cwd: str,
                       config: dict[str, Any]) -> VerificationResult:
     """
@@ -80,6 +110,7 @@ def verify_lint_clean(claim_value: str | None, cwd: str,
     # Use custom command if specified
     if custom_command:
         lint_command = custom_command
+        argv = split_command(custom_command)
         linter = "custom"
     else:
         # Auto-detect lint command
@@ -90,62 +121,65 @@ def verify_lint_clean(claim_value: str | None, cwd: str,
                 message="No linter detected, skipping verification",
                 details={"skipped": True, "reason": "no_linter"}
             )
-        lint_command, linter = detected
-
-    try:
-        result = subprocess.run(
-            shlex.split(lint_command),
-            shell=False,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-
-        if result.returncode == 0:
+        argv, linter = detected
+
+        # Opt-in: lint only the files that changed; with none, check the whole tree
+        if linter == "ruff" and config.get("changed_files_only", False):
+            changed = changed_python_files(cwd)
+            if changed:
+                argv = ("ruff", "check", "--force-exclude", *changed)
+
+        lint_command = shlex.join(argv)
+
+    def run() -> VerificationResult:
+        try:
+            result = run_command(argv, cwd, timeout, tail_bytes=1000)
+
+            if result.returncode == 0:
+                return VerificationResult(
+                    passed=True,
+                    message=f"Lint passed ({linter})",
+                    details={
+                        "command": lint_command,
+                        "linter": linter,
+                        "exit_code": result.returncode
+                    }
+                )
+            else:
+                # Extract lint errors
+                output_tail = result.output_tail or "No output"
+
+                return VerificationResult(
+                    passed=False,
+                    message=f"Lint errors found ({linter})",
+                    details={
+                        "command": lint_command,
+                        "linter": linter,
+                        "exit_code": result.returncode,
+                        "output_tail": output_tail
+                    }
+                )
+
+        except subprocess.TimeoutExpired:
             return VerificationResult(
-                passed=True,
-                message=f"Lint passed ({linter})",
+                passed=False,
+                message=f"Lint check timed out after {timeout}s",
                 details={
                     "command": lint_command,
                     "linter": linter,
-                    "exit_code": result.returncode
+                    "timeout": timeout,
+                    "error": "timeout"
                 }
             )
-        else:
-            # Extract lint errors
-            output = result.stdout + result.stderr
-            output_tail = output[-1000:] if output else "No output"
-
+        except Exception as e:
             return VerificationResult(
                 passed=False,
-                message=f"Lint errors found ({linter})",
+                message=f"Failed to run linter: {str(e)}",
                 details={
                     "command": lint_command,
                     "linter": linter,
-                    "exit_code": result.returncode,
-                    "output_tail": output_tail
+                    "error": str(e)
                 }
             )
 
-    except subprocess.TimeoutExpired:
-        return VerificationResult(
-            passed=False,
-            message=f"Lint check timed out after {timeout}s",
-            details={
-                "command": lint_command,
-                "linter": linter,
-                "timeout": timeout,
-                "error": "timeout"
-            }
-        )
-    except Exception as e:
-        return VerificationResult(
-            passed=False,
-            message=f"Failed to run linter: {str(e)}",
-            details={
-                "command": lint_command,
-                "linter": linter,
-                "error": str(e)
-            }
-        )
+    return run_cached("lint", argv, cwd, config, run)
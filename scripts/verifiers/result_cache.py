@@ -0,0 +1,204 @@
+"""On-disk cache of passing verification results, keyed by working tree state."""
+
+import hashlib
+import json
+import os
+import subprocess
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+from .base import VerificationResult
+from .command_runner import run_git
+
+CACHE_DIR = Path.home() / ".cache" / "verify-claims"
+
+# Entries kept per cache file; older ones are dropped when a new one is stored
+MAX_ENTRIES = 64
+
+
+def _changed_paths(status: bytes) -> list[bytes]:
+    """
+    Get the paths listed in `git status --porcelain=v2 -z` output.
+
+    Args:
+        status: Raw output of the status command
+
+    Returns:
+        Paths of changed, unmerged and untracked entries
+    """
+    paths = []
+    records = iter(status.split(b"\0"))
+    for record in records:
+        kind = record[:1]
+        if kind == b"1":
+            paths.append(record.split(b" ", 8)[8])
+        elif kind == b"2":
+            paths.append(record.split(b" ", 9)[9])
+            # Renames and copies are followed by the original path
+            next(records, None)
+        elif kind == b"u":
+            paths.append(record.split(b" ", 10)[10])
+        elif kind == b"?":
+            paths.append(record[2:])
+    return paths
+
+
+def compute_cache_key(argv: Sequence[str], cwd: str) -> str | None:
+    """
+    Compute a key identifying a command run against the current working tree.
+
+    The key covers the command, the directory, the checked-out commit, every
+    changed or untracked path with its index state, and the size and mtime of
+    those paths. A clean tree takes a single `git status` call; a dirty one
+    also asks git for the work tree root to find the paths. Files ignored by
+    git are not covered.
+
+    Args:
+        argv: Command that will be run
+        cwd: Directory it will be run in
+
+    Returns:
+        Hex digest, or None if cwd isn't a git work tree or git failed
+    """
+    try:
+        result = run_git(
+            ["status", "--porcelain=v2", "--branch", "-z", "--untracked-files=all"],
+            cwd,
+            text=False
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+
+    digest = hashlib.sha256()
+    digest.update(os.path.abspath(cwd).encode())
+    digest.update(b"\0".join(arg.encode() for arg in argv))
+    digest.update(result.stdout)
+
+    paths = _changed_paths(result.stdout)
+    if paths:
+        # Status paths are relative to the top of the work tree, which
+        # isn't cwd when the command runs from a subdirectory
+        try:
+            toplevel = run_git(["rev-parse", "--show-toplevel"], cwd, text=False)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if toplevel.returncode != 0:
+            return None
+        root = toplevel.stdout.rstrip(b"\n")
+
+    for path in paths:
+        try:
+            st = os.stat(os.path.join(root, path))
+            digest.update(f"{st.st_mtime_ns}:{st.st_size}".encode())
+        except OSError:
+            digest.update(b"missing")
+
+    return digest.hexdigest()
+
+
+def _cache_file(kind: str) -> Path:
+    """Get the path of a named cache file."""
+    return CACHE_DIR / f"{kind}.json"
+
+
+def _load(kind: str) -> dict[str, dict]:
+    """Load a cache file, treating a missing or corrupt file as empty."""
+    try:
+        with open(_cache_file(kind)) as f:
+            entries = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return entries if isinstance(entries, dict) else {}
+
+
+def get_cached_result(kind: str, key: str) -> VerificationResult | None:
+    """
+    Look up a previously stored passing result.
+
+    Args:
+        kind: Cache name (e.g. "build", "lint")
+        key: Key from compute_cache_key
+
+    Returns:
+        The cached VerificationResult marked as cached, or None on a miss
+    """
+    entry = _load(kind).get(key)
+    if not isinstance(entry, dict):
+        return None
+
+    details = dict(entry.get("details", {}))
+    details["cached"] = True
+    return VerificationResult(
+        passed=True,
+        message=f"{entry.get('message', '')} (cached)",
+        details=details
+    )
+
+
+def store_result(kind: str, key: str, result: VerificationResult) -> None:
+    """
+    Store a passing result; failures are never cached.
+
+    Args:
+        kind: Cache name (e.g. "build", "lint")
+        key: Key from compute_cache_key
+        result: Result of running the command
+    """
+    if not result.passed:
+        return
+
+    entries = _load(kind)
+    entries.pop(key, None)
+    entries[key] = {
+        "message": result.message,
+        "details": result.details,
+        "timestamp": time.time()
+    }
+    # Dicts keep insertion order, so the oldest entries come first
+    for old_key in list(entries)[:-MAX_ENTRIES]:
+        del entries[old_key]
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = _cache_file(kind).with_name(f"{kind}.json.{os.getpid()}.tmp")
+        with open(tmp_file, 'w') as f:
+            json.dump(entries, f, separators=(',', ':'))
+        os.replace(tmp_file, _cache_file(kind))
+    except OSError:
+        pass
+
+
+def run_cached(kind: str, argv: Sequence[str], cwd: str, config: dict[str, Any],
+               run: Callable[[], VerificationResult]) -> VerificationResult:
+    """
+    Run a verification command, reusing a passing result if the working tree
+    hasn't changed since it was stored.
+
+    Args:
+        kind: Cache name (e.g. "build", "lint")
+        argv: Command that run executes
+        cwd: Directory it runs in
+        config: Verifier configuration; no_cache skips the cache entirely
+        run: Runs the command and returns its result
+
+    Returns:
+        The cached result on a hit, otherwise the result of run
+    """
+    if config.get("no_cache", False):
+        return run()
+
+    key = compute_cache_key(argv, cwd)
+    if key is None:
+        return run()
+
+    cached = get_cached_result(kind, key)
+    if cached is not None:
+        return cached
+
+    result = run()
+    store_result(kind, key, result)
+    return result
@@ -2,17 +2,82 @@
 
 import shlex
 import subprocess
+from collections.abc import Callable
 from typing import Any
 
 from .base import VerificationResult
 from .command_detection import (
-    file_exists,
-    read_package_json,
-    read_pyproject_toml,
+    cached_detection,
+    get_npm_scripts,
+    has_subdirectory,
+    project_files,
+    pyproject_mentions,
 )
+from .command_runner import run_command, split_command
+from .result_cache import run_cached
 
+TestCommand = tuple[tuple[str, ...], str]
 
-def detect_test_command(cwd: str) -> tuple[str, str] | None:
+
+def _npm_test(cwd: str, names: frozenset[str]) -> TestCommand | None:
+    """Use the package.json test script, if there is one."""
+    scripts = get_npm_scripts(cwd)
+    if scripts is not None:
+        if "test" in scripts:
+            return (("npm", "test"), "npm")
+        if "test:unit" in scripts:
+            return (("npm", "run", "test:unit"), "npm")
+    return None
+
+
+def _pytest(cwd: str, names: frozenset[str]) -> TestCommand | None:
+    """Use pytest if it's configured, mentioned in pyproject.toml or there's a tests dir."""
+    if ("pytest.ini" in names
+            or pyproject_mentions(cwd, "pytest")
+            or has_subdirectory(cwd, "tests")):
+        return (("pytest",), "pytest")
+    return None
+
+
+def _ruby_test(cwd: str, names: frozenset[str]) -> TestCommand | None:
+    """Use rspec or rake depending on which test directory exists."""
+    if has_subdirectory(cwd, "spec"):
+        return (("bundle", "exec", "rspec"), "rspec")
+    if has_subdirectory(cwd, "test"):
+        return (("bundle", "exec", "rake", "test"), "rake")
+    return None
+
+
+def _always(command: TestCommand) -> Callable[[str, frozenset[str]], TestCommand]:
+    """Make a rule that always returns the given command."""
+    return lambda cwd, names: command
+
+
+# Detection rules in priority order: the first rule whose marker files are
+# present and that returns a command wins
+_TEST_RULES: tuple[tuple[frozenset[str], Callable[[str, frozenset[str]], TestCommand | None]], ...] = (
+    (frozenset({"package.json"}), _npm_test),
+    (frozenset({"pytest.ini", "pyproject.toml", "setup.py"}), _pytest),
+    (frozenset({"Cargo.toml"}), _always((("cargo", "test"), "cargo"))),
+    (frozenset({"go.mod"}), _always((("go", "test", "./..."), "go"))),
+    (frozenset({"Gemfile"}), _ruby_test),
+    (frozenset({"pom.xml"}), _always((("mvn", "test"), "maven"))),
+    (frozenset({"build.gradle", "build.gradle.kts"}), _always((("./gradlew", "test"), "gradle"))),
+)
+
+
+# Output that frameworks print as soon as a test fails, long before the run
+# ends. Only used with fail_fast; frameworks that report failures only in
+# their final summary (pytest, rspec) have nothing to gain and aren't listed.
+_FAIL_MARKERS: dict[str, tuple[bytes, ...]] = {
+    "npm": (b"\nFAIL ",),
+    "cargo": (b"test result: FAILED",),
+    "go": (b"--- FAIL:",),
+}
+
+
+@cached_detection
+def detect_test_command(cwd: str) -> TestCommand | None:
     """
     Detect the appropriate test command for the project.
 
@@ -20,53 +85,14 @@ def detect_test_command(cwd: str) -> tuple[str, str] | None:
         cwd: Current working directory
 
     Returns:
-        Tuple of (command, framework_name) or None if not detected
+        Tuple of (command argv, framework_name) or None if not detected
     """
-    # Node.js/npm projects
-    pkg = read_package_json(cwd)
-    if pkg:
-        scripts = pkg.get("scripts", {})
-        if "test" in scripts:
-            return ("npm test", "npm")
-        if "test:unit" in scripts:
-            return ("npm run test:unit", "npm")
-
-    # Python projects
-    if file_exists(cwd, "pytest.ini", "pyproject.toml", "setup.py"):
-        # Check for pytest
-        if file_exists(cwd, "pytest.ini"):
-            return ("pytest", "pytest")
-        # Check pyproject.toml for pytest
-        content = read_pyproject_toml(cwd)
-        if content and ("pytest" in content or "[tool.pytest" in content):
-            return ("pytest", "pytest")
-        # Default to pytest if tests directory exists
-        if file_exists(cwd, "tests"):
-            return ("pytest", "pytest")
-
-    # Rust projects
-    if file_exists(cwd, "Cargo.toml"):
-        return ("cargo test", "cargo")
-
-    # Go projects
-    if file_exists(cwd, "go.mod"):
-        return ("go test ./...", "go")
-
-    # Ruby projects
-    if file_exists(cwd, "Gemfile"):
-        if file_exists(cwd, "spec"):
-            return ("bundle exec rspec", "rspec")
-        if file_exists(cwd, "test"):
-            return ("bundle exec rake test", "rake")
-
-    # Java/Maven projects
-    if file_exists(cwd, "pom.xml"):
-        return ("mvn test", "maven")
-
-    # Java/Gradle projects
-    if file_exists(cwd, "build.gradle", "build.gradle.kts"):
-        return ("./gradlew test", "gradle")
-
+    names = project_files(cwd)
+    for markers, rule in _TEST_RULES:
+        if names & markers:
+            detected = rule(cwd, names)
+            if detected is not None:
+                return detected
     return None
 
 
@@ -89,6 +115,7 @@ def verify_tests_pass(claim_value: str | None, cwd: str,
     # Use custom command if specified
     if custom_command:
         test_command = custom_command
+        argv = split_command(custom_command)
         framework = "custom"
     else:
         # Auto-detect test command
@@ -99,64 +126,65 @@ def verify_tests_pass(claim_value: str | None, cwd: str,
                 message="No test framework detected, skipping verification",
                 details={"skipped": True, "reason": "no_test_framework"}
             )
-        test_command, framework = detected
-
-    try:
-        result = subprocess.run(
-            shlex.split(test_command),
-            shell=False,
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-
-        if result.returncode == 0:
+        argv, framework = detected
+        test_command = shlex.join(argv)
+
+    fail_markers = _FAIL_MARKERS.get(framework, ()) if config.get("fail_fast", False) else ()
+
+    def run() -> VerificationResult:
+        try:
+            result = run_command(argv, cwd, timeout, tail_bytes=1000, fail_markers=fail_markers)
+
+            if result.returncode == 0:
+                return VerificationResult(
+                    passed=True,
+                    message=f"Tests passed ({framework})",
+                    details={
+                        "command": test_command,
+                        "framework": framework,
+                        "exit_code": result.returncode,
+                        "stdout_tail": result.output_tail[-500:]
+                    }
+                )
+            else:
+                # The end of the output usually contains the failure summary
+                output_tail = result.output_tail or "No output"
+
+                details = {
+                    "command": test_command,
+                    "framework": framework,
+                    "exit_code": result.returncode,
+                    "output_tail": output_tail
+                }
+                if result.stopped_early:
+                    details["stopped_early"] = True
+
+                return VerificationResult(
+                    passed=False,
+                    message=f"Tests failed ({framework})",
+                    details=details
+                )
+
+        except subprocess.TimeoutExpired:
             return VerificationResult(
-                passed=True,
-                message=f"Tests passed ({framework})",
+                passed=False,
+                message=f"Test run timed out after {timeout}s",
                 details={
                     "command": test_command,
                     "framework": framework,
-                    "exit_code": result.returncode,
-                    "stdout_tail": result.stdout[-500:] if result.stdout else ""
+                    "timeout": timeout,
+                    "error": "timeout"
                 }
             )
-        else:
-            # Extract relevant failure info
-            output = result.stdout + result.stderr
-            # Get last 1000 chars which usually contains failure summary
-            output_tail = output[-1000:] if output else "No output"
-
+        except Exception as e:
             return VerificationResult(
                 passed=False,
-                message=f"Tests failed ({framework})",
+                message=f"Failed to run tests: {str(e)}",
                 details={
                     "command": test_command,
                     "framework": framework,
-                    "exit_code": result.returncode,
-                    "output_tail": output_tail
+                    "error": str(e)
                 }
             )
 
-    except subprocess.TimeoutExpired:
-        return VerificationResult(
-            passed=False,
-            message=f"Test run timed out after {timeout}s",
-            details={
-                "command": test_command,
-                "framework": framework,
-                "timeout": timeout,
-                "error": "timeout"
-            }
-        )
-    except Exception as e:
-        return VerificationResult(
-            passed=False,
-            message=f"Failed to run tests: {str(e)}",
-            details={
-                "command": test_command,
-                "framework": framework,
-                "error": str(e)
-            }
-        )
+    return run_cached("tests", argv, cwd, config, run)
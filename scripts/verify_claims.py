@@ -17,13 +17,12 @@ from typing import Any
 script_dir = Path(__file__).parent
 sys.path.insert(0, str(script_dir))
 
-from claim_parser import parse_claims  # noqa: E402
-from transcript_reader import get_recent_assistant_text  # noqa: E402
+# The transcript reader, claim parser and verifiers are imported inside
+# main() once they're needed, so hook calls that exit early skip them
 from utils.config import get_config_value, load_config  # noqa: E402
 from utils.logger import get_logger  # noqa: E402
 from utils.state import SessionState  # noqa: E402
 from utils.state import VerificationResult as StateVerificationResult  # noqa: E402
-from verifiers import verify_claim  # noqa: E402
 
 
 def read_hook_input() -> dict[str, Any]:
@@ -65,28 +64,26 @@ def main() -> int:
 
     logger.info(f"Verify-claims hook started for session: {session_id}")
 
-    # Initialize session state
-    state = SessionState(session_id)
-
-    # Cleanup old state files periodically
-    cleanup_days = get_config_value(config, "behavior", "cleanup_days", default=30)
-    SessionState.cleanup_old_states(cleanup_days)
-
-    # Prevent infinite loops - check if we're already in a verification
-    if state.stop_hook_active:
+    # Prevent infinite loops - check if we're already in a verification.
+    # This goes through a lock file so the fast path never loads the state.
+    if not SessionState.acquire_stop_hook_lock(session_id):
         logger.warning("Stop hook already active, allowing to prevent loop")
         return 0
 
-    # Check max retries
-    max_retries = get_config_value(config, "behavior", "max_retries", default=3)
-    if state.verification_count >= max_retries:
-        logger.warning(f"Max retries ({max_retries}) reached, allowing completion")
-        return 0
+    try:
+        # Initialize session state
+        state = SessionState(session_id)
 
-    # Mark hook as active
-    state.stop_hook_active = True
+        # Cleanup old state files periodically
+        cleanup_days = get_config_value(config, "behavior", "cleanup_days", default=30)
+        SessionState.cleanup_old_states(cleanup_days)
+
+        # Check max retries
+        max_retries = get_config_value(config, "behavior", "max_retries", default=3)
+        if state.verification_count >= max_retries:
+            logger.warning(f"Max retries ({max_retries}) reached, allowing completion")
+            return 0
 
-    try:
         # Increment verification count
         count = state.increment_verification_count()
         logger.info(f"Verification attempt {count}/{max_retries}")
@@ -96,12 +93,16 @@ def main() -> int:
             logger.warning("No transcript path provided or file doesn't exist")
             return 0
 
+        from transcript_reader import get_recent_assistant_text
+
         # Get recent assistant text
         assistant_text = get_recent_assistant_text(transcript_path, message_count=3)
         if not assistant_text:
             logger.info("No assistant text found in transcript")
             return 0
 
+        from claim_parser import parse_claims
+
         # Parse claims from the text
         confidence_threshold = get_config_value(
             config, "behavior", "confidence_threshold", default=0.7
@@ -114,55 +115,61 @@ def main() -> int:
 
         logger.info(f"Found {len(claims)} claims to verify")
 
-        # Verify each claim
-        failed_claims: list[dict[str, Any]] = []
-        passed_claims: list[dict[str, Any]] = []
+        from verifiers import verify_claims_concurrently
 
+        # Verify all claims, running their verifiers concurrently
         for claim in claims:
             logger.debug(f"Verifying claim: {claim.claim_type} - {claim.claim_text}")
 
-            result = verify_claim(
-                claim.claim_type,
-                claim.extracted_value,
-                cwd,
-                config
-            )
+        results = verify_claims_concurrently(
+            [(claim.claim_type, claim.extracted_value) for claim in claims],
+            cwd,
+            config
+        )
 
-            # Record result in state
-            state.add_verification_result(StateVerificationResult(
+        # Record all results in state with a single write
+        now = time.time()
+        state.add_verification_results([
+            StateVerificationResult(
                 claim_type=claim.claim_type,
                 claim_text=claim.claim_text,
                 passed=result.passed,
                 message=result.message,
-                timestamp=time.time(),
+                timestamp=now,
                 details=result.details
-            ))
+            )
+            for claim, result in zip(claims, results, strict=True)
+        ])
 
+        for claim, result in zip(claims, results, strict=True):
             if result.passed:
                 logger.info(f"✓ Claim verified: {claim.claim_type}")
-                passed_claims.append({
-                    "type": claim.claim_type,
-                    "text": claim.claim_text,
-                    "message": result.message
-                })
+            elif result.details.get("skipped"):
+                logger.info(f"○ Claim skipped: {claim.claim_type} - {result.message}")
             else:
-                # Check if verification was skipped (not a real failure)
-                if result.details.get("skipped"):
-                    logger.info(f"○ Claim skipped: {claim.claim_type} - {result.message}")
-                    passed_claims.append({
-                        "type": claim.claim_type,
-                        "text": claim.claim_text,
-                        "message": result.message,
-                        "skipped": True
-                    })
-                else:
-                    logger.warning(f"✗ Claim failed: {claim.claim_type} - {result.message}")
-                    failed_claims.append({
-                        "type": claim.claim_type,
-                        "text": claim.claim_text,
-                        "message": result.message,
-                        "details": result.details
-                    })
+                logger.warning(f"✗ Claim failed: {claim.claim_type} - {result.message}")
+
+        # Skipped verifications aren't real failures, so they count as passed
+        passed_claims: list[dict[str, Any]] = [
+            {
+                "type": claim.claim_type,
+                "text": claim.claim_text,
+                "message": result.message,
+                **({"skipped": True} if not result.passed else {})
+            }
+            for claim, result in zip(claims, results, strict=True)
+            if result.passed or result.details.get("skipped")
+        ]
+        failed_claims: list[dict[str, Any]] = [
+            {
+                "type": claim.claim_type,
+                "text": claim.claim_text,
+                "message": result.message,
+                "details": result.details
+            }
+            for claim, result in zip(claims, results, strict=True)
+            if not result.passed and not result.details.get("skipped")
+        ]
 
         # Determine if we should block
         block_on_failure = get_config_value(
@@ -197,8 +204,8 @@ def main() -> int:
         return 0
 
     finally:
-        # Always clear the active flag
-        state.stop_hook_active = False
+        # Always release the lock
+        SessionState.release_stop_hook_lock(session_id)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,8 @@
 """Pytest configuration and shared fixtures."""
 
 import json
+import os
 import sys
-import tempfile
 from pathlib import Path
 
 import pytest
@@ -11,112 +11,133 @@ import pytest
 scripts_dir = Path(__file__).parent.parent / "scripts"
 sys.path.insert(0, str(scripts_dir))
 
+from verifiers.command_detection import clear_detection_cache  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_detection_cache():
+    """Don't let cached project detection leak between tests."""
+    clear_detection_cache()
+    yield
+    clear_detection_cache()
+
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
+def temp_dir(tmp_path_factory):
+    """
+    Create a fresh temporary directory for a test.
+
+    Directories are made under pytest's session-wide temp root, so each test
+    costs one mkdir and cleanup happens once, between sessions.
+    """
+    return str(tmp_path_factory.mktemp("tmp"))
+
+
+def _write_file(path: str, data: bytes) -> None:
+    """Write bytes to a new file with a single open/write/close."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+# Fixture file contents, serialized once at import
+_NPM_PACKAGE_JSON = json.dumps({
+    "name": "test-project",
+    "version": "1.0.0",
+    "scripts": {
+        "test": "jest",
+        "lint": "eslint .",
+        "build": "tsc"
+    }
+}).encode()
+
+_PYPROJECT_TOML = b"""
+[tool.pytest.ini_options]
+testpaths = ["tests"]
+
+[tool.ruff]
+line-length = 100
+"""
+
+_CARGO_TOML = b"""
+[package]
+name = "test_project"
+version = "0.1.0"
+edition = "2021"
+"""
+
+_GO_MOD = b"module example.com/test\n\ngo 1.21\n"
+
+_SAMPLE_TRANSCRIPT = "".join(json.dumps(msg) + "\n" for msg in [
+    {"type": "user", "message": "Create a config file"},
+    {
+        "type": "assistant",
+        "message": {
+            "content": [
+                {"type": "text", "text": "I've created the config.json file for you."}
+            ]
+        }
+    },
+    {"type": "user", "message": "Run the tests"},
+    {
+        "type": "assistant",
+        "message": {
+            "content": [
+                {"type": "text", "text": "All tests pass now. The build succeeded."}
+            ]
+        }
+    }
+]).encode()
 
 
 @pytest.fixture
-def temp_project_dir(temp_dir):
-    """Create a temporary project directory with common files."""
-    project_dir = Path(temp_dir) / "test_project"
-    project_dir.mkdir()
-    return str(project_dir)
+def temp_project_dir(tmp_path_factory):
+    """
+    Create a fresh temporary project directory for a test.
+
+    Like temp_dir, it is a numbered directory under pytest's temp root, which
+    pytest-xdist gives each worker separately.
+    """
+    return str(tmp_path_factory.mktemp("test_project"))
 
 
 @pytest.fixture
 def npm_project(temp_project_dir):
     """Create a mock npm project."""
-    package_json = {
-        "name": "test-project",
-        "version": "1.0.0",
-        "scripts": {
-            "test": "jest",
-            "lint": "eslint .",
-            "build": "tsc"
-        }
-    }
-    pkg_path = Path(temp_project_dir) / "package.json"
-    with open(pkg_path, 'w') as f:
-        json.dump(package_json, f)
+    _write_file(os.path.join(temp_project_dir, "package.json"), _NPM_PACKAGE_JSON)
     return temp_project_dir
 
 
 @pytest.fixture
 def python_project(temp_project_dir):
     """Create a mock Python project with pytest."""
-    pyproject = """
-[tool.pytest.ini_options]
-testpaths = ["tests"]
-
-[tool.ruff]
-line-length = 100
-"""
-    pyproject_path = Path(temp_project_dir) / "pyproject.toml"
-    with open(pyproject_path, 'w') as f:
-        f.write(pyproject)
-
-    tests_dir = Path(temp_project_dir) / "tests"
-    tests_dir.mkdir()
+    _write_file(os.path.join(temp_project_dir, "pyproject.toml"), _PYPROJECT_TOML)
+    os.mkdir(os.path.join(temp_project_dir, "tests"))
     return temp_project_dir
 
 
 @pytest.fixture
 def rust_project(temp_project_dir):
     """Create a mock Rust project."""
-    cargo_toml = """
-[package]
-name = "test_project"
-version = "0.1.0"
-edition = "2021"
-"""
-    cargo_path = Path(temp_project_dir) / "Cargo.toml"
-    with open(cargo_path, 'w') as f:
-        f.write(cargo_toml)
+    _write_file(os.path.join(temp_project_dir, "Cargo.toml"), _CARGO_TOML)
     return temp_project_dir
 
 
 @pytest.fixture
 def go_project(temp_project_dir):
     """Create a mock Go project."""
-    go_mod = "module example.com/test\n\ngo 1.21\n"
-    gomod_path = Path(temp_project_dir) / "go.mod"
-    with open(gomod_path, 'w') as f:
-        f.write(go_mod)
+    _write_file(os.path.join(temp_project_dir, "go.mod"), _GO_MOD)
     return temp_project_dir
 
 
 @pytest.fixture
 def sample_transcript(temp_dir):
     """Create a sample transcript JSONL file."""
-    transcript_path = Path(temp_dir) / "transcript.jsonl"
-    messages = [
-        {"type": "user", "message": "Create a config file"},
-        {
-            "type": "assistant",
-            "message": {
-                "content": [
-                    {"type": "text", "text": "I've created the config.json file for you."}
-                ]
-            }
-        },
-        {"type": "user", "message": "Run the tests"},
-        {
-            "type": "assistant",
-            "message": {
-                "content": [
-                    {"type": "text", "text": "All tests pass now. The build succeeded."}
-                ]
-            }
-        }
-    ]
-    with open(transcript_path, 'w') as f:
-        for msg in messages:
-            f.write(json.dumps(msg) + "\n")
-    return str(transcript_path)
+    transcript_path = os.path.join(temp_dir, "transcript.jsonl")
+    _write_file(transcript_path, _SAMPLE_TRANSCRIPT)
+    return transcript_path
 
 
 @pytest.fixture
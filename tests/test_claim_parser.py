@@ -1,6 +1,39 @@
 """Tests for claim_parser.py"""
 
-from claim_parser import Claim, extract_file_paths, get_claim_summary, parse_claims
+from unittest.mock import patch
+
+import pytest
+from claim_parser import (
+    _CLAIM_KEYWORDS,
+    CLAIM_PATTERNS,
+    Claim,
+    _compiled_patterns,
+    extract_file_paths,
+    get_claim_summary,
+    parse_claims,
+)
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python 3.10
+    import sre_parse
+
+
+
+def _can_match(items) -> bool:
+    """Check whether a parsed pattern can match anything at all."""
+    for op, av in items:
+        name = str(op)
+        if name == "ASSERT_NOT" and not av[1]:
+            # (?!) never matches
+            return False
+        if name == "SUBPATTERN" and not _can_match(av[3]):
+            return False
+        if name == "BRANCH" and not any(_can_match(branch) for branch in av[1]):
+            return False
+        if name in ("MAX_REPEAT", "MIN_REPEAT") and av[0] > 0 and not _can_match(av[2]):
+            return False
+    return True
 
 
 class TestParseClaims:
@@ -33,19 +66,17 @@ class TestParseClaims:
         test_claims = [c for c in claims if c.claim_type == "tests_pass"]
         assert len(test_claims) == 1
 
-    def test_parse_tests_pass_variations(self):
+    @pytest.mark.parametrize("text", [
+        "Tests are now passing",
+        "All 42 tests passed",
+        "The tests completed successfully",
+        "Tests should now work",
+    ])
+    def test_parse_tests_pass_variations(self, text):
         """Test various ways of expressing tests passing."""
-        test_cases = [
-            "Tests are now passing",
-            "All 42 tests passed",
-            "The tests completed successfully",
-            "Tests should now work",
-        ]
-
-        for text in test_cases:
-            claims = parse_claims(text, confidence_threshold=0.7)
-            test_claims = [c for c in claims if c.claim_type == "tests_pass"]
-            assert len(test_claims) >= 1, f"Failed for: {text}"
+        claims = parse_claims(text, confidence_threshold=0.7)
+        test_claims = [c for c in claims if c.claim_type == "tests_pass"]
+        assert len(test_claims) >= 1
 
     def test_parse_lint_clean_claim(self):
         """Test parsing lint clean claims."""
@@ -55,19 +86,17 @@ class TestParseClaims:
         lint_claims = [c for c in claims if c.claim_type == "lint_clean"]
         assert len(lint_claims) == 1
 
-    def test_parse_lint_clean_variations(self):
+    @pytest.mark.parametrize("text", [
+        "Linting is now clean",
+        "No linting issues",
+        "All lint checks pass",
+        "ESLint shows no errors",
+    ])
+    def test_parse_lint_clean_variations(self, text):
         """Test various ways of expressing lint clean."""
-        test_cases = [
-            "Linting is now clean",
-            "No linting issues",
-            "All lint checks pass",
-            "ESLint shows no errors",
-        ]
-
-        for text in test_cases:
-            claims = parse_claims(text, confidence_threshold=0.7)
-            lint_claims = [c for c in claims if c.claim_type == "lint_clean"]
-            assert len(lint_claims) >= 1, f"Failed for: {text}"
+        claims = parse_claims(text, confidence_threshold=0.7)
+        lint_claims = [c for c in claims if c.claim_type == "lint_clean"]
+        assert len(lint_claims) >= 1
 
     def test_parse_build_success_claim(self):
         """Test parsing build success claims."""
@@ -77,19 +106,17 @@ class TestParseClaims:
         build_claims = [c for c in claims if c.claim_type == "build_success"]
         assert len(build_claims) == 1
 
-    def test_parse_build_success_variations(self):
+    @pytest.mark.parametrize("text", [
+        "The project builds successfully",
+        "Build completed successfully",
+        "Compiled without errors",
+        "npm run build succeeded",
+    ])
+    def test_parse_build_success_variations(self, text):
         """Test various ways of expressing build success."""
-        test_cases = [
-            "The project builds successfully",
-            "Build completed successfully",
-            "Compiled without errors",
-            "npm run build succeeded",
-        ]
-
-        for text in test_cases:
-            claims = parse_claims(text, confidence_threshold=0.7)
-            build_claims = [c for c in claims if c.claim_type == "build_success"]
-            assert len(build_claims) >= 1, f"Failed for: {text}"
+        claims = parse_claims(text, confidence_threshold=0.7)
+        build_claims = [c for c in claims if c.claim_type == "build_success"]
+        assert len(build_claims) >= 1
 
     def test_parse_bug_fixed_claim(self):
         """Test parsing bug fix claims."""
@@ -99,19 +126,17 @@ class TestParseClaims:
         fix_claims = [c for c in claims if c.claim_type == "bug_fixed"]
         assert len(fix_claims) == 1
 
-    def test_parse_bug_fixed_variations(self):
+    @pytest.mark.parametrize("text", [
+        "Fixed the issue",
+        "The problem is now resolved",
+        "I've addressed the error",
+        "Bug is fixed",
+    ])
+    def test_parse_bug_fixed_variations(self, text):
         """Test various ways of expressing bug fixes."""
-        test_cases = [
-            "Fixed the issue",
-            "The problem is now resolved",
-            "I've addressed the error",
-            "Bug is fixed",
-        ]
-
-        for text in test_cases:
-            claims = parse_claims(text, confidence_threshold=0.7)
-            fix_claims = [c for c in claims if c.claim_type == "bug_fixed"]
-            assert len(fix_claims) >= 1, f"Failed for: {text}"
+        claims = parse_claims(text, confidence_threshold=0.7)
+        fix_claims = [c for c in claims if c.claim_type == "bug_fixed"]
+        assert len(fix_claims) >= 1
 
     def test_parse_multiple_claims(self):
         """Test parsing multiple claims in one text."""
@@ -136,6 +161,27 @@ class TestParseClaims:
         file_claims = [c for c in claims if c.claim_type == "file_created"]
         assert len(file_claims) == 0
 
+    def test_text_without_keywords_skips_patterns(self):
+        """Test that text with no claim keywords isn't run through the patterns."""
+        text = "Here is the summary you asked for. Let me know what you think!"
+        with patch('claim_parser._iter_matches') as mock_iter:
+            assert parse_claims(text) == []
+        mock_iter.assert_not_called()
+
+    def test_keyword_check_is_case_insensitive(self):
+        """Test that upper-case claims still pass the keyword check."""
+        claims = parse_claims("ALL TESTS PASS NOW")
+        assert [c.claim_type for c in claims] == ["tests_pass"]
+
+    def test_every_pattern_requires_a_keyword(self):
+        """Test that no pattern can match once its keywords are made unmatchable."""
+        for patterns in CLAIM_PATTERNS.values():
+            for pattern, _ in patterns:
+                stripped = pattern.lower()
+                for keyword in _CLAIM_KEYWORDS:
+                    stripped = stripped.replace(keyword, "(?!)")
+                assert not _can_match(sre_parse.parse(stripped)), pattern
+
     def test_confidence_threshold(self):
         """Test that confidence threshold filters low-confidence claims."""
         text = "Tests should now work."  # Lower confidence phrase
@@ -150,6 +196,37 @@ class TestParseClaims:
 
         assert len(test_claims_low) >= len(test_claims_high)
 
+    def test_threshold_between_confidence_levels(self):
+        """Test thresholds that fall between pattern confidences."""
+        text = "Tests should now work."  # Matched at 0.7 confidence
+
+        assert [c.confidence for c in parse_claims(text, confidence_threshold=0.65)] == [0.7]
+        assert [c.confidence for c in parse_claims(text, confidence_threshold=0.7)] == [0.7]
+        assert parse_claims(text, confidence_threshold=0.71) == []
+
+    def test_default_threshold_compiled_at_import(self):
+        """Test that parsing at the default threshold reuses patterns compiled on import."""
+        misses = _compiled_patterns.cache_info().misses
+        parse_claims("All tests pass")
+        parse_claims("All tests pass", confidence_threshold=0.7)
+        assert _compiled_patterns.cache_info().misses == misses
+
+    def test_overlapping_file_claims_all_found(self):
+        """Test that a file claim overlapping another pattern's match is still found."""
+        text = "`index.ts` has been written to src/index.ts"
+        claims = parse_claims(text, confidence_threshold=0.7)
+
+        file_values = [c.extracted_value for c in claims if c.claim_type == "file_created"]
+        assert file_values == ["src/index.ts", "index.ts"]
+
+    def test_claim_uses_highest_priority_pattern(self):
+        """Test that a non-file claim comes from the first matching pattern, not the earliest text."""
+        text = "Tests should now work. All 42 tests passed."
+        claims = parse_claims(text, confidence_threshold=0.7)
+
+        test_claims = [c for c in claims if c.claim_type == "tests_pass"]
+        assert [(c.claim_text, c.confidence) for c in test_claims] == [("tests passed", 0.9)]
+
     def test_duplicate_file_claims_deduplicated(self):
         """Test that duplicate file claims are deduplicated."""
         text = """
@@ -173,6 +250,15 @@ class TestParseClaims:
         # The file path should preserve case
         assert any("MyComponent.tsx" in (c.extracted_value or "") for c in file_claims)
 
+    def test_claim_text_keeps_original_case(self):
+        """Test that non-file claims match any case and keep the original text."""
+        text = "All Tests PASS now."
+        claims = parse_claims(text, confidence_threshold=0.7)
+
+        test_claims = [c for c in claims if c.claim_type == "tests_pass"]
+        assert len(test_claims) == 1
+        assert test_claims[0].claim_text == "All Tests PASS"
+
 
 class TestExtractFilePaths:
     """Tests for the extract_file_paths function."""
@@ -201,6 +287,11 @@ class TestExtractFilePaths:
         paths = extract_file_paths(text)
         assert "./src/index.ts" in paths
 
+    def test_paths_in_order_of_appearance(self):
+        """Test that quoted and bare paths come back in the order they appear."""
+        text = 'See ./a.py and `b.json`, then (/c/d.md) and "e.ts" or ./a.py'
+        assert extract_file_paths(text) == ["./a.py", "b.json", "/c/d.md", "e.ts"]
+
     def test_deduplicate_paths(self):
         """Test that duplicate paths are deduplicated."""
         text = "`config.json` and `config.json` again"
@@ -230,3 +321,13 @@ class TestGetClaimSummary:
         """Test summary with no claims."""
         summary = get_claim_summary([])
         assert summary == {}
+
+    def test_duplicates_dropped_in_order(self):
+        """Test that repeated values are listed once, in first-seen order."""
+        claims = [
+            Claim("file_created", "created b.py", 0.9, "b.py"),
+            Claim("file_created", "created a.py", 0.9, "a.py"),
+            Claim("file_created", "wrote b.py", 0.9, "b.py"),
+        ]
+
+        assert get_claim_summary(claims) == {"file_created": ["b.py", "a.py"]}
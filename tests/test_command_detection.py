@@ -1,25 +1,49 @@
 """Tests for verifiers/command_detection.py"""
 
 import json
-from pathlib import Path
+import os
+from unittest.mock import patch
 
+import pytest
+import verifiers.command_detection as command_detection
 from verifiers.command_detection import (
+    clear_detection_cache,
     detect_project_type,
     file_exists,
+    get_npm_scripts,
+    get_pyproject_tools,
+    has_subdirectory,
+    project_entries,
+    pyproject_mentions,
     read_package_json,
     read_pyproject_toml,
 )
 
 
+def make_files(directory: str, *names: str) -> None:
+    """Create empty files in a directory."""
+    for name in names:
+        os.close(os.open(os.path.join(directory, name), os.O_CREAT | os.O_WRONLY, 0o644))
+
+
+def write_file(directory: str, name: str, data: str | bytes) -> None:
+    """Create or overwrite a file in a directory."""
+    if isinstance(data, str):
+        data = data.encode()
+    fd = os.open(os.path.join(directory, name), os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
 class TestReadPackageJson:
     """Tests for the read_package_json function."""
 
     def test_read_valid_package_json(self, temp_project_dir):
         """Test reading a valid package.json file."""
         pkg_data = {"name": "test", "version": "1.0.0", "scripts": {"test": "jest"}}
-        pkg_path = Path(temp_project_dir) / "package.json"
-        with open(pkg_path, 'w') as f:
-            json.dump(pkg_data, f)
+        write_file(temp_project_dir, "package.json", json.dumps(pkg_data))
 
         result = read_package_json(temp_project_dir)
         assert result == pkg_data
@@ -31,13 +55,80 @@ class TestReadPackageJson:
 
     def test_read_invalid_json(self, temp_project_dir):
         """Test reading an invalid JSON file."""
-        pkg_path = Path(temp_project_dir) / "package.json"
-        with open(pkg_path, 'w') as f:
-            f.write("{invalid json")
+        write_file(temp_project_dir, "package.json", "{invalid json")
 
         result = read_package_json(temp_project_dir)
         assert result is None
 
+    def test_read_invalid_utf8(self, temp_project_dir):
+        """Test that a package.json that isn't UTF-8 is treated as unreadable."""
+        write_file(temp_project_dir, "package.json", b'{"name": "\xff"}')
+
+        assert read_package_json(temp_project_dir) is None
+
+    def test_reread_after_package_json_edit(self, temp_project_dir):
+        """Test that editing package.json in place invalidates the cached result."""
+        write_file(temp_project_dir, "package.json", json.dumps({"scripts": {}}))
+        assert read_package_json(temp_project_dir) == {"scripts": {}}
+
+        write_file(temp_project_dir, "package.json", json.dumps({"scripts": {"test": "jest"}}))
+        assert read_package_json(temp_project_dir) == {"scripts": {"test": "jest"}}
+
+    def test_file_read_once_for_all_readers(self, npm_project):
+        """Test that package.json is read from disk once for both of its parsers."""
+        with patch('builtins.open', wraps=open) as mock_open:
+            read_package_json(npm_project)
+            get_npm_scripts(npm_project)
+
+        opened = [call.args[0] for call in mock_open.call_args_list]
+        assert opened == [os.path.join(npm_project, "package.json")]
+
+
+class TestGetNpmScripts:
+    """Tests for the get_npm_scripts function."""
+
+    def test_script_names(self, temp_project_dir):
+        """Test that the script names are returned as a frozenset."""
+        pkg = {"scripts": {"test": "jest", "build": "tsc"}}
+        write_file(temp_project_dir, "package.json", json.dumps(pkg))
+
+        assert get_npm_scripts(temp_project_dir) == frozenset({"test", "build"})
+
+    def test_no_scripts(self, temp_project_dir):
+        """Test a package.json without a usable scripts table."""
+        write_file(temp_project_dir, "package.json", '{"name": "x", "scripts": "jest"}')
+
+        assert get_npm_scripts(temp_project_dir) == frozenset()
+
+    def test_no_package_json(self, temp_project_dir):
+        """Test that a missing package.json gives None."""
+        assert get_npm_scripts(temp_project_dir) is None
+
+    def test_no_scripts_key(self, temp_project_dir):
+        """Test that a package.json without "scripts" has no scripts."""
+        write_file(temp_project_dir, "package.json", '{"name": "x"}')
+
+        assert get_npm_scripts(temp_project_dir) == frozenset()
+
+    @pytest.mark.parametrize("content", ['{"name": ', "[1, 2]", "{\n}", "null"])
+    def test_unusable_package_json_without_scripts_key(self, temp_project_dir, content):
+        """Test that malformed, non-object or empty JSON gives None with or without "scripts"."""
+        write_file(temp_project_dir, "package.json", content)
+
+        assert get_npm_scripts(temp_project_dir) is None
+
+    def test_empty_package_json(self, temp_project_dir):
+        """Test that an empty package.json counts as no package.json."""
+        write_file(temp_project_dir, "package.json", "{}\n")
+
+        assert get_npm_scripts(temp_project_dir) is None
+
+    def test_invalid_package_json(self, temp_project_dir):
+        """Test that unparseable JSON with a scripts key gives None."""
+        write_file(temp_project_dir, "package.json", '{"scripts": {')
+
+        assert get_npm_scripts(temp_project_dir) is None
+
 
 class TestReadPyprojectToml:
     """Tests for the read_pyproject_toml function."""
@@ -51,9 +142,7 @@ testpaths = ["tests"]
 [tool.ruff]
 line-length = 100
 """
-        pyproject_path = Path(temp_project_dir) / "pyproject.toml"
-        with open(pyproject_path, 'w') as f:
-            f.write(content)
+        write_file(temp_project_dir, "pyproject.toml", content)
 
         result = read_pyproject_toml(temp_project_dir)
         assert result is not None
@@ -66,13 +155,95 @@ line-length = 100
         assert result is None
 
 
+class TestPyprojectMentions:
+    """Tests for the pyproject_mentions function."""
+
+    def test_text_found(self, temp_project_dir):
+        """Test that text anywhere in the file is found."""
+        content = '[project]\ndependencies = ["pytest>=7"]\n'
+        write_file(temp_project_dir, "pyproject.toml", content)
+
+        assert pyproject_mentions(temp_project_dir, "pytest") is True
+        assert pyproject_mentions(temp_project_dir, "ruff") is False
+
+    def test_missing_pyproject(self, temp_project_dir):
+        """Test that a missing file mentions nothing."""
+        assert pyproject_mentions(temp_project_dir, "pytest") is False
+
+    def test_rescanned_after_edit(self, temp_project_dir):
+        """Test that editing the file invalidates the cached answer."""
+        write_file(temp_project_dir, "pyproject.toml", '[project]\nname = "x"\n')
+        assert pyproject_mentions(temp_project_dir, "pytest") is False
+
+        write_file(temp_project_dir, "pyproject.toml", '[tool.pytest.ini_options]\ntestpaths = ["tests"]\n')
+        assert pyproject_mentions(temp_project_dir, "pytest") is True
+
+
+class TestGetPyprojectTools:
+    """Tests for the get_pyproject_tools function."""
+
+    @pytest.fixture(params=["tomllib", "regex"])
+    def parser(self, request, monkeypatch):
+        """Run each test with tomllib (when available) and the regex fallback."""
+        if request.param == "regex":
+            monkeypatch.setattr(command_detection, "_tomllib", lambda: None)
+        elif command_detection._tomllib() is None:
+            pytest.skip("tomllib not available")
+        return request.param
+
+    def test_tool_tables(self, temp_project_dir, parser):
+        """Test that [tool.*] tables are reported by tool name."""
+        content = """
+[project]
+dependencies = ["pytest"]
+
+[tool.pytest.ini_options]
+testpaths = ["tests"]
+
+[tool.ruff]
+line-length = 100
+
+[tool.ruff.lint]
+select = ["E"]
+"""
+        write_file(temp_project_dir, "pyproject.toml", content)
+
+        assert get_pyproject_tools(temp_project_dir) == {"pytest", "ruff"}
+
+    def test_commented_table_ignored(self, temp_project_dir, parser):
+        """Test that a commented-out table header doesn't count."""
+        content = '# [tool.ruff]\n[tool.black]\nline-length = 100\n'
+        write_file(temp_project_dir, "pyproject.toml", content)
+
+        assert get_pyproject_tools(temp_project_dir) == {"black"}
+
+    def test_missing_pyproject(self, temp_project_dir, parser):
+        """Test that a project without pyproject.toml has no tools."""
+        assert get_pyproject_tools(temp_project_dir) == frozenset()
+
+    def test_invalid_toml_falls_back_to_headers(self, temp_project_dir):
+        """Test that unparseable files still report table headers."""
+        content = '[tool.ruff]\nline-length = \n'
+        write_file(temp_project_dir, "pyproject.toml", content)
+
+        assert get_pyproject_tools(temp_project_dir) == {"ruff"}
+
+    def test_file_read_once_for_all_readers(self, python_project):
+        """Test that pyproject.toml is read from disk once for every reader."""
+        with patch('builtins.open', wraps=open) as mock_open:
+            get_pyproject_tools(python_project)
+            pyproject_mentions(python_project, "pytest")
+
+        opened = [call.args[0] for call in mock_open.call_args_list]
+        assert opened == [os.path.join(python_project, "pyproject.toml")]
+
+
 class TestFileExists:
     """Tests for the file_exists function."""
 
     def test_single_file_exists(self, temp_project_dir):
         """Test checking for a single existing file."""
-        pkg_path = Path(temp_project_dir) / "package.json"
-        pkg_path.touch()
+        make_files(temp_project_dir, "package.json")
 
         assert file_exists(temp_project_dir, "package.json") is True
 
@@ -82,15 +253,13 @@ class TestFileExists:
 
     def test_multiple_files_first_exists(self, temp_project_dir):
         """Test checking for multiple files when first exists."""
-        pkg_path = Path(temp_project_dir) / "package.json"
-        pkg_path.touch()
+        make_files(temp_project_dir, "package.json")
 
         assert file_exists(temp_project_dir, "package.json", "Cargo.toml") is True
 
     def test_multiple_files_second_exists(self, temp_project_dir):
         """Test checking for multiple files when second exists."""
-        cargo_path = Path(temp_project_dir) / "Cargo.toml"
-        cargo_path.touch()
+        make_files(temp_project_dir, "Cargo.toml")
 
         assert file_exists(temp_project_dir, "package.json", "Cargo.toml") is True
 
@@ -100,56 +269,101 @@ class TestFileExists:
 
     def test_directory_as_path(self, temp_project_dir):
         """Test checking for a directory."""
-        tests_dir = Path(temp_project_dir) / "tests"
-        tests_dir.mkdir()
+        os.mkdir(os.path.join(temp_project_dir, "tests"))
 
         assert file_exists(temp_project_dir, "tests") is True
 
+    def test_with_precomputed_entries(self, temp_project_dir):
+        """Test that top-level names are looked up in the given entries."""
+        os.mkdir(os.path.join(temp_project_dir, "src"))
+        make_files(temp_project_dir, "Cargo.toml", os.path.join("src", "main.rs"))
+        entries = project_entries(temp_project_dir)
+
+        with patch('verifiers.command_detection.os.path.exists') as mock_exists:
+            assert file_exists(temp_project_dir, "go.mod", "Cargo.toml", entries=entries) is True
+            assert file_exists(temp_project_dir, "go.mod", entries=entries) is False
+        mock_exists.assert_not_called()
+
+        assert file_exists(temp_project_dir, "src/main.rs", entries=entries) is True
+        assert file_exists(temp_project_dir, "src/lib.rs", entries=entries) is False
+
+
+class TestHasSubdirectory:
+    """Tests for the has_subdirectory function."""
+
+    def test_directory(self, temp_project_dir):
+        """Test that a directory is reported."""
+        os.mkdir(os.path.join(temp_project_dir, "tests"))
+
+        assert has_subdirectory(temp_project_dir, "tests") is True
+
+    def test_file_is_not_directory(self, temp_project_dir):
+        """Test that a file with the same name doesn't count."""
+        write_file(temp_project_dir, "tests", "")
+
+        assert has_subdirectory(temp_project_dir, "tests") is False
+
+    def test_symlink_to_directory(self, temp_project_dir):
+        """Test that a link to a directory counts."""
+        os.mkdir(os.path.join(temp_project_dir, "real_tests"))
+        os.symlink("real_tests", os.path.join(temp_project_dir, "tests"))
+
+        assert has_subdirectory(temp_project_dir, "tests") is True
+
+    def test_missing(self, temp_project_dir):
+        """Test that a missing entry isn't a directory."""
+        assert has_subdirectory(temp_project_dir, "tests") is False
+
 
 class TestDetectProjectType:
     """Tests for the detect_project_type function."""
 
     def test_detect_npm_project(self, temp_project_dir):
         """Test detecting an npm project."""
-        pkg_path = Path(temp_project_dir) / "package.json"
-        pkg_path.touch()
+        make_files(temp_project_dir, "package.json")
 
         types = detect_project_type(temp_project_dir)
         assert "npm" in types
 
     def test_detect_python_project(self, temp_project_dir):
         """Test detecting a Python project."""
-        pyproject_path = Path(temp_project_dir) / "pyproject.toml"
-        pyproject_path.touch()
+        make_files(temp_project_dir, "pyproject.toml")
 
         types = detect_project_type(temp_project_dir)
         assert "python" in types
 
     def test_detect_rust_project(self, temp_project_dir):
         """Test detecting a Rust project."""
-        cargo_path = Path(temp_project_dir) / "Cargo.toml"
-        cargo_path.touch()
+        make_files(temp_project_dir, "Cargo.toml")
 
         types = detect_project_type(temp_project_dir)
         assert "rust" in types
 
     def test_detect_go_project(self, temp_project_dir):
         """Test detecting a Go project."""
-        gomod_path = Path(temp_project_dir) / "go.mod"
-        gomod_path.touch()
+        make_files(temp_project_dir, "go.mod")
 
         types = detect_project_type(temp_project_dir)
         assert "go" in types
 
     def test_detect_multiple_project_types(self, temp_project_dir):
         """Test detecting multiple project types."""
-        (Path(temp_project_dir) / "package.json").touch()
-        (Path(temp_project_dir) / "pyproject.toml").touch()
+        make_files(temp_project_dir, "package.json", "pyproject.toml")
 
         types = detect_project_type(temp_project_dir)
         assert "npm" in types
         assert "python" in types
 
+    def test_detect_without_stat_per_marker(self, temp_project_dir):
+        """Test that markers are matched against one directory listing."""
+        make_files(temp_project_dir, "go.mod", "Makefile")
+
+        with patch('verifiers.command_detection.os.path.exists') as mock_exists:
+            types = detect_project_type(temp_project_dir)
+
+        assert types == ["go", "make"]
+        mock_exists.assert_not_called()
+
     def test_detect_no_project_type(self, temp_project_dir):
         """Test detecting no project type."""
         types = detect_project_type(temp_project_dir)
@@ -157,32 +371,53 @@ class TestDetectProjectType:
 
     def test_detect_java_maven_project(self, temp_project_dir):
         """Test detecting a Maven project."""
-        pom_path = Path(temp_project_dir) / "pom.xml"
-        pom_path.touch()
+        make_files(temp_project_dir, "pom.xml")
 
         types = detect_project_type(temp_project_dir)
         assert "java_maven" in types
 
     def test_detect_java_gradle_project(self, temp_project_dir):
         """Test detecting a Gradle project."""
-        gradle_path = Path(temp_project_dir) / "build.gradle"
-        gradle_path.touch()
+        make_files(temp_project_dir, "build.gradle")
 
         types = detect_project_type(temp_project_dir)
         assert "java_gradle" in types
 
     def test_detect_make_project(self, temp_project_dir):
         """Test detecting a Make project."""
-        makefile_path = Path(temp_project_dir) / "Makefile"
-        makefile_path.touch()
+        make_files(temp_project_dir, "Makefile")
 
         types = detect_project_type(temp_project_dir)
         assert "make" in types
 
     def test_detect_typescript_project(self, temp_project_dir):
         """Test detecting a TypeScript project."""
-        tsconfig_path = Path(temp_project_dir) / "tsconfig.json"
-        tsconfig_path.touch()
+        make_files(temp_project_dir, "tsconfig.json")
 
         types = detect_project_type(temp_project_dir)
         assert "typescript" in types
+
+
+class TestDetectionCache:
+    """Tests for caching of detection results."""
+
+    def test_result_reused_until_project_changes(self, temp_project_dir):
+        """Test that detection is cached and refreshed when markers are added."""
+        write_file(temp_project_dir, "go.mod", "module x\n")
+        assert detect_project_type(temp_project_dir) == ["go"]
+
+        with patch('verifiers.command_detection.os.scandir') as mock_scandir:
+            assert detect_project_type(temp_project_dir) == ["go"]
+            mock_scandir.assert_not_called()
+
+        write_file(temp_project_dir, "Makefile", "all:\n")
+        assert detect_project_type(temp_project_dir) == ["go", "make"]
+
+    def test_clear_detection_cache(self, temp_project_dir):
+        """Test that clearing the cache forces detection to run again."""
+        assert detect_project_type(temp_project_dir) == []
+        clear_detection_cache()
+
+        with patch('verifiers.command_detection.os.scandir', wraps=os.scandir) as mock_scandir:
+            assert detect_project_type(temp_project_dir) == []
+            mock_scandir.assert_called_once_with(temp_project_dir)
@@ -0,0 +1,194 @@
+"""Tests for verifiers/command_runner.py"""
+
+import os
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+from verifiers.command_runner import _join_tail, run_command, run_git, split_command
+
+
+def python_argv(code: str) -> list[str]:
+    """Build argv that runs a Python snippet."""
+    return [sys.executable, "-c", code]
+
+
+def assert_process_exits(pid: int, timeout: float = 5) -> None:
+    """Wait for a process to go away, failing if it's still running."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return
+        time.sleep(0.05)
+    pytest.fail(f"process {pid} is still running")
+
+
+class TestSplitCommand:
+    """Tests for the split_command function."""
+
+    def test_splits_quoted_arguments(self):
+        """Test that quoting is handled like a shell would."""
+        assert split_command("make -j2 'all targets'") == ("make", "-j2", "all targets")
+
+    def test_result_is_reused(self):
+        """Test that repeated commands are served from the cache."""
+        split_command.cache_clear()
+        split_command("cargo build")
+        split_command("cargo build")
+
+        assert split_command.cache_info().hits == 1
+
+
+class TestJoinTail:
+    """Tests for joining the tail of the output chunks."""
+
+    def test_tail_within_last_chunk(self):
+        """Test a tail shorter than the last chunk."""
+        assert _join_tail([b"abc", b"defgh"], 3) == b"fgh"
+
+    def test_tail_spanning_chunks(self):
+        """Test a tail that starts in an earlier chunk."""
+        assert _join_tail([b"abc", b"de", b"fg"], 5) == b"cdefg"
+
+    def test_tail_longer_than_output(self):
+        """Test that all output is returned when it is shorter than the tail."""
+        assert _join_tail([b"ab", b"cd"], 100) == b"abcd"
+
+    def test_no_output(self):
+        """Test that no chunks give empty output."""
+        assert _join_tail([], 10) == b""
+
+
+class TestRunCommand:
+    """Tests for the run_command function."""
+
+    def test_success(self, temp_dir):
+        """Test a command that succeeds."""
+        result = run_command(python_argv("print('ok')"), temp_dir, timeout=30)
+
+        assert result.returncode == 0
+        assert result.output_tail.strip() == "ok"
+
+    def test_exit_code(self, temp_dir):
+        """Test that the command's exit code is returned."""
+        result = run_command(python_argv("import sys; sys.exit(3)"), temp_dir, timeout=30)
+
+        assert result.returncode == 3
+
+    def test_stderr_merged(self, temp_dir):
+        """Test that stderr is captured along with stdout."""
+        code = "import sys; print('out', flush=True); print('err', file=sys.stderr)"
+        result = run_command(python_argv(code), temp_dir, timeout=30)
+
+        assert "out" in result.output_tail
+        assert "err" in result.output_tail
+
+    def test_only_tail_kept(self, temp_dir):
+        """Test that large output is reduced to its last tail_bytes bytes."""
+        code = "import sys; sys.stdout.write('x' * 500000 + 'END')"
+        result = run_command(python_argv(code), temp_dir, timeout=30, tail_bytes=100)
+
+        assert len(result.output_tail) == 100
+        assert result.output_tail.endswith("xEND")
+
+    def test_runs_in_cwd(self, temp_dir):
+        """Test that the command runs in the given directory."""
+        result = run_command(python_argv("import os; print(os.getcwd())"), temp_dir, timeout=30)
+
+        assert result.output_tail.strip().endswith(temp_dir.rstrip("/").rsplit("/", 1)[-1])
+
+    def test_timeout(self, temp_dir):
+        """Test that a command that runs too long is killed."""
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_command(python_argv("import time; time.sleep(30)"), temp_dir, timeout=0.5)
+
+    def test_missing_executable(self, temp_dir):
+        """Test that a missing executable raises OSError."""
+        with pytest.raises(OSError):
+            run_command(["definitely-not-a-real-command-xyz"], temp_dir, timeout=30)
+
+    def test_fail_marker_stops_command(self, temp_dir):
+        """Test that a command is killed once it prints a fail marker."""
+        code = "import time; print('--- FAIL: TestX', flush=True); time.sleep(30)"
+        result = run_command(python_argv(code), temp_dir, timeout=20,
+                             fail_markers=(b"--- FAIL:",))
+
+        assert result.stopped_early is True
+        assert result.returncode != 0
+        assert "--- FAIL: TestX" in result.output_tail
+
+    def test_fail_marker_split_across_reads(self, temp_dir):
+        """Test that a marker written in two pieces is still found."""
+        code = (
+            "import sys, time\n"
+            "sys.stdout.write('test result: FA'); sys.stdout.flush(); time.sleep(0.2)\n"
+            "sys.stdout.write('ILED'); sys.stdout.flush(); time.sleep(30)"
+        )
+        result = run_command(python_argv(code), temp_dir, timeout=20,
+                             fail_markers=(b"test result: FAILED",))
+
+        assert result.stopped_early is True
+
+    def test_fail_marker_stops_child_processes(self, temp_dir):
+        """Test that processes started by the command are killed with it."""
+        code = (
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+            "print(child.pid); print('--- FAIL: TestX', flush=True); time.sleep(30)"
+        )
+        start = time.monotonic()
+        result = run_command(python_argv(code), temp_dir, timeout=20,
+                             fail_markers=(b"--- FAIL:",))
+
+        assert result.stopped_early is True
+        assert time.monotonic() - start < 10
+        assert_process_exits(int(result.output_tail.split()[0]))
+
+    def test_timeout_stops_child_processes(self, temp_dir):
+        """Test that a timeout kills the processes the command started too."""
+        code = (
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])\n"
+            "open('child.pid', 'w').write(str(child.pid)); time.sleep(30)"
+        )
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_command(python_argv(code), temp_dir, timeout=1)
+
+        with open(os.path.join(temp_dir, "child.pid")) as f:
+            assert_process_exits(int(f.read()))
+
+    def test_no_fail_marker(self, temp_dir):
+        """Test that a command without fail markers in its output runs to completion."""
+        result = run_command(python_argv("print('ok')"), temp_dir, timeout=30,
+                             fail_markers=(b"--- FAIL:",))
+
+        assert result.returncode == 0
+        assert result.stopped_early is False
+
+
+class TestRunGit:
+    """Tests for the run_git function."""
+
+    def test_runs_in_repository(self, temp_dir):
+        """Test that git runs against the given directory."""
+        subprocess.run(["git", "init", "-q"], cwd=temp_dir, check=True)
+
+        result = run_git(["rev-parse", "--is-inside-work-tree"], temp_dir)
+
+        assert result.returncode == 0
+        assert result.stdout.strip() == "true"
+
+    def test_spawn_friendly_arguments(self, temp_dir):
+        """Test that git is started by absolute path without a child cwd."""
+        with patch('verifiers.command_runner.subprocess.run') as mock_run:
+            run_git(["status"], temp_dir)
+
+        argv = mock_run.call_args.args[0]
+        assert os.path.isabs(argv[0])
+        assert argv[1:] == ["-C", temp_dir, "status"]
+        assert "cwd" not in mock_run.call_args.kwargs
+        assert mock_run.call_args.kwargs["close_fds"] is False
@@ -3,6 +3,7 @@
 import json
 from pathlib import Path
 
+import pytest
 from utils.config import deep_merge, get_config_value, load_config
 
 
@@ -52,6 +53,17 @@ class TestDeepMerge:
 
         assert base["a"] == 1
 
+    def test_nested_base_unchanged(self):
+        """Test that nested dicts in base are copied before being merged into."""
+        base = {"verifiers": {"tests_pass": {"timeout": 60}, "lint_clean": {"timeout": 30}}}
+        override = {"verifiers": {"tests_pass": {"timeout": 5}}}
+        result = deep_merge(base, override)
+
+        assert result["verifiers"]["tests_pass"]["timeout"] == 5
+        assert base["verifiers"]["tests_pass"]["timeout"] == 60
+        # Subtrees the override doesn't touch aren't copied
+        assert result["verifiers"]["lint_clean"] is base["verifiers"]["lint_clean"]
+
 
 class TestGetConfigValue:
     """Tests for the get_config_value function."""
@@ -100,43 +112,29 @@ class TestGetConfigValue:
 class TestLoadConfig:
     """Tests for the load_config function."""
 
-    def test_load_default_config(self, temp_project_dir, temp_dir):
-        """Test loading default configuration."""
-        # Create a plugin root with default config
-        plugin_root = Path(temp_dir) / "plugin"
-        config_dir = plugin_root / "config"
-        config_dir.mkdir(parents=True)
-
+    @pytest.fixture(scope="module")
+    def plugin_root(self, tmp_path_factory):
+        """Create a plugin root with a default config, shared by the tests that only read it."""
+        root = tmp_path_factory.mktemp("plugin")
+        (root / "config").mkdir()
         default_config = {
             "verifiers": {
                 "tests_pass": {"enabled": True, "timeout": 60}
             },
             "debug": False
         }
-        with open(config_dir / "default_config.json", 'w') as f:
-            json.dump(default_config, f)
+        (root / "config" / "default_config.json").write_text(json.dumps(default_config))
+        return str(root)
 
-        config = load_config(temp_project_dir, str(plugin_root))
+    def test_load_default_config(self, temp_project_dir, plugin_root):
+        """Test loading default configuration."""
+        config = load_config(temp_project_dir, plugin_root)
 
         assert config["verifiers"]["tests_pass"]["enabled"] is True
         assert config["verifiers"]["tests_pass"]["timeout"] == 60
 
-    def test_project_override(self, temp_project_dir, temp_dir):
+    def test_project_override(self, temp_project_dir, plugin_root):
         """Test that project config overrides defaults."""
-        # Create plugin root with default config
-        plugin_root = Path(temp_dir) / "plugin"
-        config_dir = plugin_root / "config"
-        config_dir.mkdir(parents=True)
-
-        default_config = {
-            "verifiers": {
-                "tests_pass": {"enabled": True, "timeout": 60}
-            },
-            "debug": False
-        }
-        with open(config_dir / "default_config.json", 'w') as f:
-            json.dump(default_config, f)
-
         # Create project override
         project_claude_dir = Path(temp_project_dir) / ".claude"
         project_claude_dir.mkdir()
@@ -149,7 +147,7 @@ class TestLoadConfig:
         with open(project_claude_dir / "verify-claims.json", 'w') as f:
             json.dump(project_config, f)
 
-        config = load_config(temp_project_dir, str(plugin_root))
+        config = load_config(temp_project_dir, plugin_root)
 
         # Default values should be preserved
         assert config["verifiers"]["tests_pass"]["enabled"] is True
@@ -165,15 +163,39 @@ class TestLoadConfig:
         config = load_config(temp_project_dir, str(plugin_root))
         assert config == {}
 
-    def test_missing_project_config(self, temp_project_dir, temp_dir):
+    def test_missing_project_config(self, temp_project_dir, plugin_root):
         """Test loading with missing project config."""
+        config = load_config(temp_project_dir, plugin_root)
+        assert config["debug"] is False
+
+    def test_cached_config_is_a_copy(self, temp_project_dir, temp_dir):
+        """Test that mutating a loaded config doesn't affect later loads."""
         plugin_root = Path(temp_dir) / "plugin"
         config_dir = plugin_root / "config"
         config_dir.mkdir(parents=True)
-
-        default_config = {"debug": False}
         with open(config_dir / "default_config.json", 'w') as f:
-            json.dump(default_config, f)
+            json.dump({"behavior": {"max_retries": 3}}, f)
 
         config = load_config(temp_project_dir, str(plugin_root))
-        assert config["debug"] is False
+        config["behavior"]["max_retries"] = 99
+
+        assert load_config(temp_project_dir, str(plugin_root))["behavior"]["max_retries"] == 3
+
+    def test_reloads_when_project_config_changes(self, temp_project_dir, temp_dir):
+        """Test that editing the project config invalidates the cache."""
+        plugin_root = Path(temp_dir) / "plugin"
+        plugin_root.mkdir()
+        project_claude_dir = Path(temp_project_dir) / ".claude"
+        project_claude_dir.mkdir()
+        project_config_path = project_claude_dir / "verify-claims.json"
+
+        with open(project_config_path, 'w') as f:
+            json.dump({"debug": False}, f)
+        assert load_config(temp_project_dir, str(plugin_root))["debug"] is False
+
+        with open(project_config_path, 'w') as f:
+            json.dump({"debug": True, "enabled": True}, f)
+        config = load_config(temp_project_dir, str(plugin_root))
+
+        assert config["debug"] is True
+        assert config["enabled"] is True
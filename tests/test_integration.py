@@ -1,23 +1,38 @@
 """
 Integration tests for verify-claims plugin.
 
-These tests run the hooks end-to-end using subprocess with mock JSON input,
-validating the complete verification flow including:
+These tests feed mock JSON input to the hooks, validating the complete
+verification flow including:
 - Hook input/output JSON format
 - Claim detection from transcripts
 - Verifier execution
 - Block/allow decisions
+
+By default each hook's main() is called in the test process (see
+_run_hook_in_process) with stdin and stdout swapped out. Set
+VERIFY_CLAIMS_E2E=1, or pass isolated=True to a single run, to run the hook
+scripts in their own interpreter through subprocess, the way Claude Code does.
 """
 
+import contextlib
+import io
 import json
 import os
+import random
+import shutil
 import subprocess
 import sys
-import tempfile
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
+from unittest.mock import patch
 
 import pytest
+import track_tool_use
+import verify_claims
+from utils import jsonio
+from utils.state import SessionState
+from verifiers import result_cache
 
 # Plugin root directory
 PLUGIN_ROOT = Path(__file__).parent.parent
@@ -25,12 +40,42 @@ SCRIPTS_DIR = PLUGIN_ROOT / "scripts"
 VERIFY_CLAIMS_SCRIPT = SCRIPTS_DIR / "verify_claims.py"
 TRACK_TOOL_USE_SCRIPT = SCRIPTS_DIR / "track_tool_use.py"
 
+# Command lines for running each hook script in its own interpreter
+VERIFY_CLAIMS_ARGS = (sys.executable, str(VERIFY_CLAIMS_SCRIPT))
+TRACK_TOOL_USE_ARGS = (sys.executable, str(TRACK_TOOL_USE_SCRIPT))
+
+# Environment the hooks get on top of the test's own. The rest is merged in
+# per call, since each test points HOME at its own directory.
+HOOK_ENV = {"CLAUDE_PLUGIN_ROOT": str(PLUGIN_ROOT)}
+
+# Hooks are called in-process unless VERIFY_CLAIMS_E2E=1, which runs every
+# hook script in its own interpreter the way Claude Code does
+RUN_HOOKS_ISOLATED = os.environ.get("VERIFY_CLAIMS_E2E") == "1"
+
+# Committer identity for test repositories, passed on the command line
+# rather than written to the repo config by separate `git config` calls
+GIT_IDENTITY = ("-c", "user.email=test@test.com", "-c", "user.name=Test User")
+
 
 # ============================================================================
 # Helper Functions
 # ============================================================================
 
 
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write bytes to a new file with a single open/write/close.
+
+    Args:
+        path: File to create or truncate
+        data: Complete file contents
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
 def create_transcript(
     tmpdir: str, messages: list[dict[str, Any]], filename: str = "transcript.jsonl"
 ) -> str:
@@ -44,11 +89,10 @@ def create_transcript(
     Returns:
         Path to the created transcript file
     """
-    transcript_path = Path(tmpdir) / filename
-    with open(transcript_path, "w") as f:
-        for msg in messages:
-            f.write(json.dumps(msg) + "\n")
-    return str(transcript_path)
+    transcript_path = os.path.join(tmpdir, filename)
+    with open(transcript_path, "wb") as f:
+        f.writelines(jsonio.dumps(msg) + b"\n" for msg in messages)
+    return transcript_path
 
 
 def create_assistant_message(text: str) -> dict[str, Any]:
@@ -78,16 +122,43 @@ def create_user_message(text: str) -> dict[str, Any]:
     return {"type": "user", "message": text}
 
 
+def _run_hook_in_process(main: Callable[[], int], hook_input: dict[str, Any]) -> tuple[int, str]:
+    """Call a hook's main() in this process with hook_input on stdin.
+
+    Args:
+        main: The hook module's main function
+        hook_input: Hook input, passed as JSON on stdin
+
+    Returns:
+        Tuple of (exit code, captured stdout)
+    """
+    stdout = io.StringIO()
+    with (
+        patch.dict(os.environ, HOOK_ENV),
+        patch.object(sys, "stdin", io.StringIO(json.dumps(hook_input))),
+        contextlib.redirect_stdout(stdout),
+    ):
+        returncode = main()
+    return returncode, stdout.getvalue()
+
+
 def run_verify_claims_hook(
-    session_id: str, transcript_path: str, cwd: str, timeout: int = 30
+    session_id: str, transcript_path: str, cwd: str, timeout: int = 30,
+    isolated: bool | None = None
 ) -> dict[str, Any]:
     """Run the verify_claims Stop hook and return parsed output.
 
+    The hook's main() is called in this process, which skips interpreter
+    startup; pass isolated=True to run the script in a subprocess the way
+    Claude Code does.
+
     Args:
         session_id: Unique session identifier
         transcript_path: Path to the transcript JSONL file
         cwd: Working directory for verification
-        timeout: Subprocess timeout in seconds
+        timeout: Subprocess timeout in seconds (isolated runs only)
+        isolated: Run the hook script in its own interpreter; defaults to
+            RUN_HOOKS_ISOLATED
 
     Returns:
         Dictionary with 'decision' and optionally 'reason' keys,
@@ -99,27 +170,31 @@ def run_verify_claims_hook(
         "cwd": cwd,
     }
 
-    env = os.environ.copy()
-    env["CLAUDE_PLUGIN_ROOT"] = str(PLUGIN_ROOT)
-
-    result = subprocess.run(
-        [sys.executable, str(VERIFY_CLAIMS_SCRIPT)],
-        input=json.dumps(hook_input),
-        capture_output=True,
-        text=True,
-        timeout=timeout,
-        env=env,
-    )
+    if isolated is None:
+        isolated = RUN_HOOKS_ISOLATED
 
-    # Parse JSON output if any
-    stdout = result.stdout.strip()
-    if stdout:
-        try:
-            return json.loads(stdout)
-        except json.JSONDecodeError:
-            return {"raw_output": stdout}
+    if isolated:
+        result = subprocess.run(
+            VERIFY_CLAIMS_ARGS,
+            input=jsonio.dumps(hook_input),
+            capture_output=True,
+            timeout=timeout,
+            env=os.environ | HOOK_ENV,
+        )
+        # Left as bytes; the JSON parser takes them without a decode pass
+        output = result.stdout
+    else:
+        _, output = _run_hook_in_process(verify_claims.main, hook_input)
 
-    return {}
+    # Parse JSON output if any; the parser skips surrounding whitespace itself
+    if not output or output.isspace():
+        return {}
+    try:
+        return jsonio.loads(output)
+    except jsonio.JSONDecodeError:
+        if isinstance(output, bytes):
+            output = output.decode(errors="replace")
+        return {"raw_output": output.strip()}
 
 
 def run_track_tool_use_hook(
@@ -127,6 +202,7 @@ def run_track_tool_use_hook(
     tool_name: str,
     tool_input: dict[str, Any],
     tool_output: Any = None,
+    isolated: bool | None = None,
 ) -> int:
     """Run the track_tool_use PostToolUse hook.
 
@@ -135,6 +211,8 @@ def run_track_tool_use_hook(
         tool_name: Name of the tool (Write, Edit, Bash)
         tool_input: Tool input parameters
         tool_output: Tool output (optional)
+        isolated: Run the hook script in its own interpreter; defaults to
+            RUN_HOOKS_ISOLATED
 
     Returns:
         Exit code of the hook
@@ -146,16 +224,19 @@ def run_track_tool_use_hook(
         "tool_output": tool_output or {},
     }
 
-    env = os.environ.copy()
-    env["CLAUDE_PLUGIN_ROOT"] = str(PLUGIN_ROOT)
+    if isolated is None:
+        isolated = RUN_HOOKS_ISOLATED
+
+    if not isolated:
+        returncode, _ = _run_hook_in_process(track_tool_use.main, hook_input)
+        return returncode
 
     result = subprocess.run(
-        [sys.executable, str(TRACK_TOOL_USE_SCRIPT)],
-        input=json.dumps(hook_input),
+        TRACK_TOOL_USE_ARGS,
+        input=jsonio.dumps(hook_input),
         capture_output=True,
-        text=True,
         timeout=10,
-        env=env,
+        env=os.environ | HOOK_ENV,
     )
 
     return result.returncode
@@ -192,24 +273,49 @@ def assert_verification_blocked(
         )
 
 
-def create_npm_project(tmpdir: str) -> None:
-    """Create a minimal npm project structure.
+def encode_package_json(scripts: dict[str, str]) -> bytes:
+    """Encode the test project's package.json with the given scripts.
 
     Args:
-        tmpdir: Directory to create the project in
+        scripts: npm scripts, keyed by name
+
+    Returns:
+        package.json contents
     """
     package_json = {
         "name": "test-project",
         "version": "1.0.0",
-        "scripts": {
-            "test": "echo 'All tests passed' && exit 0",
-            "lint": "echo 'No lint errors' && exit 0",
-            "build": "echo 'Build succeeded' && exit 0",
-        },
+        "scripts": scripts,
     }
-    pkg_path = Path(tmpdir) / "package.json"
-    with open(pkg_path, "w") as f:
-        json.dump(package_json, f)
+    return jsonio.dumps(package_json)
+
+
+# package.json for each npm project variant, encoded once at import
+_NPM_PASSING = encode_package_json({
+    "test": "echo 'All tests passed' && exit 0",
+    "lint": "echo 'No lint errors' && exit 0",
+    "build": "echo 'Build succeeded' && exit 0",
+})
+_NPM_FAILING_TESTS = encode_package_json({
+    "test": "echo 'FAIL: Test failed' && exit 1",
+    "lint": "echo 'No lint errors' && exit 0",
+})
+_NPM_FAILING_LINT = encode_package_json({
+    "test": "echo 'Tests passed' && exit 0",
+    "lint": "echo 'error: lint error found' && exit 1",
+})
+_NPM_FAILING_BUILD = encode_package_json({
+    "build": "echo 'error: Build failed' && exit 1",
+})
+
+
+def create_npm_project(tmpdir: str) -> None:
+    """Create a minimal npm project structure.
+
+    Args:
+        tmpdir: Directory to create the project in
+    """
+    _write_bytes(os.path.join(tmpdir, "package.json"), _NPM_PASSING)
 
 
 def create_npm_project_failing_tests(tmpdir: str) -> None:
@@ -218,17 +324,7 @@ def create_npm_project_failing_tests(tmpdir: str) -> None:
     Args:
         tmpdir: Directory to create the project in
     """
-    package_json = {
-        "name": "test-project",
-        "version": "1.0.0",
-        "scripts": {
-            "test": "echo 'FAIL: Test failed' && exit 1",
-            "lint": "echo 'No lint errors' && exit 0",
-        },
-    }
-    pkg_path = Path(tmpdir) / "package.json"
-    with open(pkg_path, "w") as f:
-        json.dump(package_json, f)
+    _write_bytes(os.path.join(tmpdir, "package.json"), _NPM_FAILING_TESTS)
 
 
 def create_npm_project_failing_lint(tmpdir: str) -> None:
@@ -237,17 +333,7 @@ def create_npm_project_failing_lint(tmpdir: str) -> None:
     Args:
         tmpdir: Directory to create the project in
     """
-    package_json = {
-        "name": "test-project",
-        "version": "1.0.0",
-        "scripts": {
-            "test": "echo 'Tests passed' && exit 0",
-            "lint": "echo 'error: lint error found' && exit 1",
-        },
-    }
-    pkg_path = Path(tmpdir) / "package.json"
-    with open(pkg_path, "w") as f:
-        json.dump(package_json, f)
+    _write_bytes(os.path.join(tmpdir, "package.json"), _NPM_FAILING_LINT)
 
 
 def create_npm_project_failing_build(tmpdir: str) -> None:
@@ -256,16 +342,7 @@ def create_npm_project_failing_build(tmpdir: str) -> None:
     Args:
         tmpdir: Directory to create the project in
     """
-    package_json = {
-        "name": "test-project",
-        "version": "1.0.0",
-        "scripts": {
-            "build": "echo 'error: Build failed' && exit 1",
-        },
-    }
-    pkg_path = Path(tmpdir) / "package.json"
-    with open(pkg_path, "w") as f:
-        json.dump(package_json, f)
+    _write_bytes(os.path.join(tmpdir, "package.json"), _NPM_FAILING_BUILD)
 
 
 def create_python_project(tmpdir: str) -> None:
@@ -274,62 +351,53 @@ def create_python_project(tmpdir: str) -> None:
     Args:
         tmpdir: Directory to create the project in
     """
-    pyproject = """
+    pyproject = b"""
 [tool.pytest.ini_options]
 testpaths = ["tests"]
 
 [tool.ruff]
 line-length = 100
 """
-    pyproject_path = Path(tmpdir) / "pyproject.toml"
-    with open(pyproject_path, "w") as f:
-        f.write(pyproject)
-
-    tests_dir = Path(tmpdir) / "tests"
-    tests_dir.mkdir()
+    _write_bytes(os.path.join(tmpdir, "pyproject.toml"), pyproject)
+    os.mkdir(os.path.join(tmpdir, "tests"))
 
 
-def create_git_repo(tmpdir: str, with_changes: bool = False) -> None:
-    """Initialize a git repository.
+def init_git_repo(tmpdir: str) -> None:
+    """Initialize a git repository with a single commit.
 
     Args:
         tmpdir: Directory to initialize git in
-        with_changes: Whether to create uncommitted changes
     """
-    # Initialize git repo
     subprocess.run(
         ["git", "init"], cwd=tmpdir, capture_output=True, check=True
     )
-    subprocess.run(
-        ["git", "config", "user.email", "test@test.com"],
-        cwd=tmpdir,
-        capture_output=True,
-        check=True,
-    )
-    subprocess.run(
-        ["git", "config", "user.name", "Test User"],
-        cwd=tmpdir,
-        capture_output=True,
-        check=True,
-    )
 
     # Create initial commit
-    readme = Path(tmpdir) / "README.md"
-    readme.write_text("# Test Project\n")
+    _write_bytes(os.path.join(tmpdir, "README.md"), b"# Test Project\n")
     subprocess.run(
         ["git", "add", "README.md"], cwd=tmpdir, capture_output=True, check=True
     )
     subprocess.run(
-        ["git", "commit", "-m", "Initial commit"],
+        ["git", *GIT_IDENTITY, "commit", "-m", "Initial commit"],
         cwd=tmpdir,
         capture_output=True,
         check=True,
     )
 
+
+def create_git_repo(tmpdir: str, template_dir: str, with_changes: bool = False) -> None:
+    """Copy the template git repository into a directory.
+
+    Args:
+        tmpdir: Directory to create the repository in
+        template_dir: Repository made by init_git_repo (the git_template_dir fixture)
+        with_changes: Whether to create uncommitted changes
+    """
+    shutil.copytree(template_dir, tmpdir, symlinks=True, dirs_exist_ok=True)
+
     if with_changes:
         # Create uncommitted changes
-        code_file = Path(tmpdir) / "main.py"
-        code_file.write_text("print('Hello World')\n")
+        _write_bytes(os.path.join(tmpdir, "main.py"), b"print('Hello World')\n")
 
 
 def create_config_file(
@@ -342,22 +410,9 @@ def create_config_file(
         config: Configuration dictionary
         filename: Config filename
     """
-    claude_dir = Path(tmpdir) / ".claude"
-    claude_dir.mkdir(exist_ok=True)
-    config_path = claude_dir / filename
-    with open(config_path, "w") as f:
-        json.dump(config, f)
-
-
-def cleanup_session_state(session_id: str) -> None:
-    """Remove session state file if it exists.
-
-    Args:
-        session_id: Session ID to clean up
-    """
-    state_file = Path.home() / ".claude" / f"verify_claims_state_{session_id}.json"
-    if state_file.exists():
-        state_file.unlink()
+    claude_dir = os.path.join(tmpdir, ".claude")
+    os.makedirs(claude_dir, exist_ok=True)
+    _write_bytes(os.path.join(claude_dir, filename), jsonio.dumps(config))
 
 
 # ============================================================================
@@ -366,20 +421,49 @@ def cleanup_session_state(session_id: str) -> None:
 
 
 @pytest.fixture
-def integration_temp_dir():
-    """Create a temporary directory for integration tests."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
+def integration_temp_dir(tmp_path_factory):
+    """Create a temporary directory for integration tests.
+
+    It lives under pytest's temp root, which pytest-xdist keeps separate per
+    worker and --basetemp can move (e.g. onto a tmpfs).
+    """
+    return str(tmp_path_factory.mktemp("integration"))
+
+
+@pytest.fixture(scope="session")
+def git_template_dir(tmp_path_factory):
+    """Build the starter git repository once; tests copy it with create_git_repo."""
+    template_dir = str(tmp_path_factory.mktemp("git_template"))
+    init_git_repo(template_dir)
+    return template_dir
+
+
+@pytest.fixture(autouse=True)
+def _temp_home(tmp_path_factory, monkeypatch):
+    """Give each test its own home directory for hook state and caches.
+
+    Hook subprocesses pick it up from HOME. In-process hooks resolved their
+    paths when they were imported, so those are patched directly.
+    """
+    home = tmp_path_factory.mktemp("home")
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setattr(SessionState, "STATE_DIR", home / ".claude")
+    monkeypatch.setattr(result_cache, "CACHE_DIR", home / ".cache" / "verify-claims")
+
+
+# Session IDs only need to differ between tests, not be unpredictable, so
+# they come from one generator instead of a uuid4 per test
+_session_id_rng = random.Random()
 
 
 @pytest.fixture
 def unique_session_id():
-    """Generate a unique session ID for each test."""
-    import uuid
-    session_id = f"test-{uuid.uuid4().hex[:8]}"
-    yield session_id
-    # Cleanup session state after test
-    cleanup_session_state(session_id)
+    """Generate a unique session ID for each test.
+
+    Its state is written under the test's own home directory (see
+    _temp_home), so there is nothing to clean up afterwards.
+    """
+    return f"test-{_session_id_rng.getrandbits(32):08x}"
 
 
 # ============================================================================
@@ -832,11 +916,11 @@ class TestBugFixedClaims:
     """Tests for bug_fixed claim verification."""
 
     def test_bug_fixed_with_git_changes(
-        self, integration_temp_dir, unique_session_id
+        self, integration_temp_dir, git_template_dir, unique_session_id
     ):
         """Test: Git repo with uncommitted changes -> verification passes."""
         # Setup: Create git repo with changes
-        create_git_repo(integration_temp_dir, with_changes=True)
+        create_git_repo(integration_temp_dir, git_template_dir, with_changes=True)
 
         # Create transcript with claim
         transcript = create_transcript(
@@ -874,18 +958,6 @@ class TestBugFixedClaims:
         subprocess.run(
             ["git", "init"], cwd=git_repo_dir, capture_output=True, check=True
         )
-        subprocess.run(
-            ["git", "config", "user.email", "test@test.com"],
-            cwd=git_repo_dir,
-            capture_output=True,
-            check=True,
-        )
-        subprocess.run(
-            ["git", "config", "user.name", "Test User"],
-            cwd=git_repo_dir,
-            capture_output=True,
-            check=True,
-        )
 
         # Create initial commit with an old date
         readme = git_repo_dir / "README.md"
@@ -898,7 +970,7 @@ class TestBugFixedClaims:
         old_date = "2020-01-01T00:00:00"
         env = {**os.environ, "GIT_AUTHOR_DATE": old_date, "GIT_COMMITTER_DATE": old_date}
         subprocess.run(
-            ["git", "commit", "-m", "Initial commit"],
+            ["git", *GIT_IDENTITY, "commit", "-m", "Initial commit"],
             cwd=git_repo_dir,
             capture_output=True,
             check=True,
@@ -946,11 +1018,11 @@ class TestBugFixedClaims:
         assert_verification_passed(output)
 
     def test_bug_fixed_with_staged_changes(
-        self, integration_temp_dir, unique_session_id
+        self, integration_temp_dir, git_template_dir, unique_session_id
     ):
         """Test: Git repo with staged changes -> verification passes."""
         # Setup: Create git repo and stage changes
-        create_git_repo(integration_temp_dir)
+        create_git_repo(integration_temp_dir, git_template_dir)
 
         # Add a new file and stage it
         code_file = Path(integration_temp_dir) / "fix.py"
@@ -980,11 +1052,11 @@ class TestBugFixedClaims:
         assert_verification_passed(output)
 
     def test_bug_fixed_with_untracked_code_file(
-        self, integration_temp_dir, unique_session_id
+        self, integration_temp_dir, git_template_dir, unique_session_id
     ):
         """Test: Git repo with new untracked code file -> verification passes."""
         # Setup: Create git repo
-        create_git_repo(integration_temp_dir)
+        create_git_repo(integration_temp_dir, git_template_dir)
 
         # Add an untracked Python file (code extension)
         code_file = Path(integration_temp_dir) / "new_feature.py"
@@ -1205,8 +1277,10 @@ class TestTrackToolUseHook:
             {"success": True},
         )
 
-        # Assert: Should succeed
+        # Assert: Should succeed and record the write
         assert result == 0
+        state = SessionState(unique_session_id)
+        assert state.was_file_written(f"{integration_temp_dir}/test.py")
 
     def test_track_bash_command(
         self, integration_temp_dir, unique_session_id
@@ -1220,7 +1294,22 @@ class TestTrackToolUseHook:
             {"exit_code": 0},
         )
 
-        # Assert: Should succeed
+        # Assert: Should succeed and record a passing test run
+        assert result == 0
+        assert SessionState(unique_session_id).last_test_passed() is True
+
+    def test_track_hook_script(
+        self, integration_temp_dir, unique_session_id
+    ):
+        """Test: The hook script itself runs in its own interpreter."""
+        result = run_track_tool_use_hook(
+            unique_session_id,
+            "Write",
+            {"file_path": f"{integration_temp_dir}/test.py"},
+            {"success": True},
+            isolated=True,
+        )
+
         assert result == 0
 
     def test_track_edit_tool(
@@ -1260,9 +1349,9 @@ class TestBlockDecisionFormat:
             ],
         )
 
-        # Run verification
+        # Run verification through the script itself, as Claude Code does
         output = run_verify_claims_hook(
-            unique_session_id, transcript, integration_temp_dir
+            unique_session_id, transcript, integration_temp_dir, isolated=True
         )
 
         # Assert: Correct structure
@@ -0,0 +1,39 @@
+"""Tests for utils/jsonio.py"""
+
+import pytest
+from utils import jsonio
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test with orjson (when installed) and the stdlib fallback."""
+    if request.param == "stdlib":
+        monkeypatch.setattr(jsonio, "orjson", None)
+    elif jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+    return request.param
+
+
+class TestJsonio:
+    """Tests for the JSON helpers."""
+
+    def test_round_trip(self, backend):
+        """Test encoding and decoding a nested document."""
+        data = {"files": [{"path": "/tmp/é.py", "ok": True}], "count": 2}
+        encoded = jsonio.dumps(data)
+
+        assert isinstance(encoded, bytes)
+        assert jsonio.loads(encoded) == data
+
+    def test_dumps_is_compact(self, backend):
+        """Test that output has no insignificant whitespace."""
+        assert jsonio.dumps({"a": [1, 2]}) == b'{"a":[1,2]}'
+
+    def test_loads_accepts_str(self, backend):
+        """Test decoding from a str."""
+        assert jsonio.loads('{"type": "assistant"}') == {"type": "assistant"}
+
+    def test_invalid_json_raises_decode_error(self, backend):
+        """Test that invalid input raises the stdlib-compatible error."""
+        with pytest.raises(jsonio.JSONDecodeError):
+            jsonio.loads(b"not json")
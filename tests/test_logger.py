@@ -111,6 +111,7 @@ class TestLogger:
             with patch.object(Logger, 'LOG_FILE', log_file):
                 log = Logger(debug=True, log_to_file=True)
                 log.info("file test message")
+                log.flush()
 
                 log_path = log_dir / log_file
                 assert log_path.exists()
@@ -140,6 +141,49 @@ class TestLogger:
             captured = capsys.readouterr()
             assert "[INFO]" in captured.err
 
+    def test_log_file_opened_once(self, temp_dir):
+        """Test that the log file handle is reused across messages."""
+        log_dir = Path(temp_dir) / "logs"
+
+        with patch.object(Logger, 'LOG_DIR', log_dir):
+            log = Logger(debug=True, log_to_file=True)
+            log.info("first")
+            handle = log._log_file_handle
+            log.info("second")
+
+            assert log._log_file_handle is handle
+            log._close()
+            content = (log_dir / Logger.LOG_FILE).read_text()
+            assert "first" in content
+            assert "second" in content
+
+    def test_info_buffered_until_flush(self, temp_dir):
+        """Test that info lines are batched and written out on flush."""
+        log_dir = Path(temp_dir) / "logs"
+
+        with patch.object(Logger, 'LOG_DIR', log_dir):
+            log = Logger(log_to_file=True)
+            log.info("buffered message")
+            log_path = log_dir / Logger.LOG_FILE
+            assert "buffered message" not in log_path.read_text()
+
+            log.flush()
+            assert "buffered message" in log_path.read_text()
+            log._close()
+
+    def test_warning_written_immediately(self, temp_dir):
+        """Test that warnings and errors don't wait in the buffer."""
+        log_dir = Path(temp_dir) / "logs"
+
+        with patch.object(Logger, 'LOG_DIR', log_dir):
+            log = Logger(log_to_file=True)
+            log.info("before")
+            log.warning("careful")
+            content = (log_dir / Logger.LOG_FILE).read_text()
+            assert "before" in content
+            assert "careful" in content
+            log._close()
+
     def test_log_to_file_disabled(self, temp_dir):
         """Test that messages are not written to file when disabled."""
         log_dir = Path(temp_dir) / "logs"
@@ -0,0 +1,207 @@
+"""Tests for verifiers/result_cache.py"""
+
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import verifiers.result_cache as result_cache
+from verifiers.base import VerificationResult
+from verifiers.build_checker import verify_build_success
+from verifiers.command_runner import CommandResult
+from verifiers.result_cache import (
+    _changed_paths,
+    compute_cache_key,
+    get_cached_result,
+    run_cached,
+    store_result,
+)
+from verifiers.test_runner import verify_tests_pass
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(temp_dir, monkeypatch):
+    """Keep cache files inside the test's temporary directory."""
+    path = Path(temp_dir) / "cache"
+    monkeypatch.setattr(result_cache, "CACHE_DIR", path)
+    return path
+
+
+@pytest.fixture
+def git_project(temp_project_dir):
+    """Create a git work tree with one untracked source file."""
+    subprocess.run(["git", "init", "-q"], cwd=temp_project_dir, check=True)
+    (Path(temp_project_dir) / "main.py").write_text("print('hi')\n")
+    return temp_project_dir
+
+
+class TestChangedPaths:
+    """Tests for parsing porcelain v2 status output."""
+
+    def test_parses_all_record_kinds(self):
+        """Test ordinary, renamed, unmerged and untracked entries."""
+        status = b"\0".join([
+            b"# branch.oid abc",
+            b"1 .M N... 100644 100644 100644 aaa bbb src/a file.py",
+            b"2 R. N... 100644 100644 100644 aaa bbb R100 new.py",
+            b"old.py",
+            b"u UU N... 100644 100644 100644 100644 aaa bbb ccc conflict.py",
+            b"? notes.txt",
+            b"",
+        ])
+
+        assert _changed_paths(status) == [
+            b"src/a file.py", b"new.py", b"conflict.py", b"notes.txt"
+        ]
+
+
+class TestComputeCacheKey:
+    """Tests for the compute_cache_key function."""
+
+    def test_not_a_git_repo(self, temp_project_dir):
+        """Test that no key is produced outside a git work tree."""
+        assert compute_cache_key(("make",), temp_project_dir) is None
+
+    def test_stable_for_unchanged_tree(self, git_project):
+        """Test that the same tree and command give the same key."""
+        assert compute_cache_key(("make",), git_project) == compute_cache_key(("make",), git_project)
+
+    def test_changes_with_command(self, git_project):
+        """Test that different commands get different keys."""
+        assert compute_cache_key(("make",), git_project) != compute_cache_key(("make", "all"), git_project)
+
+    def test_changes_when_file_edited(self, git_project):
+        """Test that editing a changed file gives a new key."""
+        before = compute_cache_key(("make",), git_project)
+        (Path(git_project) / "main.py").write_text("print('hello')\n")
+
+        assert compute_cache_key(("make",), git_project) != before
+
+    def test_changes_when_file_edited_from_subdirectory(self, git_project):
+        """Test that paths are resolved from the repo root, not cwd."""
+        subdir = Path(git_project) / "sub"
+        subdir.mkdir()
+        (subdir / "f.py").write_text("x = 1\n")
+        before = compute_cache_key(("make",), str(subdir))
+        (subdir / "f.py").write_text("x = 22\n")
+
+        assert compute_cache_key(("make",), str(subdir)) != before
+
+
+class TestStoredResults:
+    """Tests for storing and reading cached results."""
+
+    def test_round_trip(self):
+        """Test that a stored passing result is returned marked as cached."""
+        result = VerificationResult(passed=True, message="Build succeeded (make)",
+                                    details={"command": "make"})
+        store_result("build", "key", result)
+
+        cached = get_cached_result("build", "key")
+        assert cached.passed is True
+        assert cached.message == "Build succeeded (make) (cached)"
+        assert cached.details == {"command": "make", "cached": True}
+        assert get_cached_result("lint", "key") is None
+
+    def test_failures_not_stored(self):
+        """Test that failing results are never cached."""
+        store_result("build", "key", VerificationResult(passed=False, message="", details={}))
+
+        assert get_cached_result("build", "key") is None
+
+    def test_oldest_entries_dropped(self, monkeypatch):
+        """Test that the cache keeps only the most recent entries."""
+        monkeypatch.setattr(result_cache, "MAX_ENTRIES", 2)
+        for key in ("a", "b", "c"):
+            store_result("build", key, VerificationResult(passed=True, message=key, details={}))
+
+        assert get_cached_result("build", "a") is None
+        assert get_cached_result("build", "c") is not None
+
+    def test_corrupt_cache_file(self, cache_dir):
+        """Test that an unreadable cache file is treated as empty."""
+        cache_dir.mkdir()
+        (cache_dir / "build.json").write_text("{not json")
+
+        assert get_cached_result("build", "key") is None
+
+
+class TestRunCached:
+    """Tests for running a command through the cache."""
+
+    def _counting_run(self, passed):
+        """Make a run callable that records how often it's called."""
+        calls = []
+
+        def run():
+            calls.append(1)
+            return VerificationResult(passed=passed, message="ran", details={})
+        return run, calls
+
+    def test_passing_result_reused(self, git_project):
+        """Test that a passing result is returned from the cache the second time."""
+        run, calls = self._counting_run(True)
+        run_cached("lint", ["ruff"], git_project, {}, run)
+        second = run_cached("lint", ["ruff"], git_project, {}, run)
+
+        assert len(calls) == 1
+        assert second.details["cached"] is True
+
+    def test_failing_result_rerun(self, git_project):
+        """Test that a failing result is never reused."""
+        run, calls = self._counting_run(False)
+        run_cached("lint", ["ruff"], git_project, {}, run)
+        run_cached("lint", ["ruff"], git_project, {}, run)
+
+        assert len(calls) == 2
+
+    def test_outside_git_always_runs(self, temp_project_dir):
+        """Test that a directory that isn't a work tree is never cached."""
+        run, calls = self._counting_run(True)
+        run_cached("lint", ["ruff"], temp_project_dir, {}, run)
+        run_cached("lint", ["ruff"], temp_project_dir, {}, run)
+
+        assert len(calls) == 2
+
+
+class TestVerifierCaching:
+    """Tests for result caching in the verifiers."""
+
+    def test_unchanged_tree_skips_build(self, git_project):
+        """Test that a second build on an unchanged tree isn't run."""
+        config = {"command": "make"}
+        with patch('verifiers.build_checker.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=0, output_tail="")
+            first = verify_build_success(None, git_project, config)
+            second = verify_build_success(None, git_project, config)
+
+        assert mock_run.call_count == 1
+        assert first.details.get("cached") is None
+        assert second.passed is True
+        assert second.details["cached"] is True
+
+    def test_no_cache_option(self, git_project):
+        """Test that no_cache always runs the build."""
+        config = {"command": "make", "no_cache": True}
+        with patch('verifiers.build_checker.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=0, output_tail="")
+            verify_build_success(None, git_project, config)
+            verify_build_success(None, git_project, config)
+
+        assert mock_run.call_count == 2
+
+    def test_unchanged_tree_skips_tests(self, git_project, temp_dir):
+        """Test that a second test run on an unchanged tree isn't started."""
+        # Count runs in a file outside the work tree so the tree stays unchanged
+        runs = Path(temp_dir) / "runs.txt"
+        code = f"open({str(runs)!r}, 'a').write('x')"
+        config = {"command": shlex.join([sys.executable, "-c", code])}
+
+        first = verify_tests_pass(None, git_project, config)
+        second = verify_tests_pass(None, git_project, config)
+
+        assert first.passed is True
+        assert second.details["cached"] is True
+        assert runs.read_text() == "x"
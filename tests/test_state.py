@@ -4,6 +4,7 @@ import json
 import os
 import time
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from utils.state import SessionState, ToolUseRecord, VerificationResult
@@ -24,17 +25,16 @@ class TestSessionState:
         """Test creating a new session state."""
         assert session_state.session_id == "test_session_123"
         assert session_state.verification_count == 0
-        assert session_state.stop_hook_active is False
 
     def test_state_persists_to_file(self, session_state):
         """Test that state is persisted to file."""
-        session_state.stop_hook_active = True
+        session_state.increment_verification_count()
 
         # Read the state file directly
         with open(session_state.state_file) as f:
             saved_state = json.load(f)
 
-        assert saved_state["stop_hook_active"] is True
+        assert saved_state["verification_count"] == 1
 
     def test_load_existing_state(self, temp_dir, monkeypatch):
         """Test loading an existing state file."""
@@ -52,6 +52,23 @@ class TestSessionState:
         assert state2.verification_count == 1
         assert len(state2.get_files_written()) == 1
 
+    def test_lookups_rebuilt_from_existing_state(self, temp_dir, monkeypatch):
+        """Test that file and command lookups work after reloading state."""
+        test_state_dir = Path(temp_dir)
+        monkeypatch.setattr(SessionState, 'STATE_DIR', test_state_dir)
+
+        state1 = SessionState("existing_session")
+        state1.add_file_written("/path/to/file.py", "Write")
+        state1.add_command_run("pytest", exit_code=1, is_test=True)
+        state1.add_command_run("npm run lint", exit_code=0, is_lint=True)
+
+        state2 = SessionState("existing_session")
+
+        assert state2.was_file_written("/path/to/file.py") is True
+        assert state2.last_test_passed() is False
+        assert state2.last_lint_passed() is True
+        assert state2.last_build_passed() is None
+
     def test_increment_verification_count(self, session_state):
         """Test incrementing verification count."""
         assert session_state.verification_count == 0
@@ -141,15 +158,116 @@ class TestSessionState:
         assert state["verification_results"][0]["claim_type"] == "tests_pass"
         assert state["verification_results"][0]["passed"] is True
 
-    def test_stop_hook_active_property(self, session_state):
-        """Test stop_hook_active property."""
-        assert session_state.stop_hook_active is False
+    def test_add_verification_results_single_write(self, session_state):
+        """Test that several results are stored with one write."""
+        results = [
+            VerificationResult(claim_type=claim_type, claim_text=claim_type, passed=True,
+                               message="ok", timestamp=1.0, details={})
+            for claim_type in ("tests_pass", "lint_clean", "build_success")
+        ]
+
+        with patch.object(session_state, 'flush', wraps=session_state.flush) as mock_flush:
+            session_state.add_verification_results(results)
+
+        assert mock_flush.call_count == 1
+        with open(session_state.state_file) as f:
+            state = json.load(f)
+        assert [r["claim_type"] for r in state["verification_results"]] == [
+            "tests_pass", "lint_clean", "build_success"
+        ]
+
+    def test_context_manager_batches_writes(self, session_state):
+        """Test that writes inside a with block are flushed on exit."""
+        with session_state as state:
+            state.add_file_written("/path/to/file.py", "Write")
+            state.add_command_run("pytest", exit_code=0, is_test=True)
+            assert not os.path.exists(session_state.state_file)
+
+        with open(session_state.state_file) as f:
+            saved_state = json.load(f)
+
+        assert len(saved_state["files_written"]) == 1
+        assert len(saved_state["commands_run"]) == 1
 
-        session_state.stop_hook_active = True
-        assert session_state.stop_hook_active is True
+    def test_failed_write_keeps_previous_state(self, session_state, monkeypatch):
+        """Test that a failed save leaves the old file and no temp file behind."""
+        session_state.increment_verification_count()
 
-        session_state.stop_hook_active = False
-        assert session_state.stop_hook_active is False
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", fail_replace)
+        with pytest.raises(OSError):
+            session_state.increment_verification_count()
+
+        with open(session_state.state_file) as f:
+            assert json.load(f)["verification_count"] == 1
+        assert os.listdir(session_state.STATE_DIR) == [session_state.state_file.name]
+
+    def test_flush(self, session_state):
+        """Test flushing pending writes explicitly."""
+        with session_state:
+            session_state.increment_verification_count()
+            session_state.flush()
+
+            with open(session_state.state_file) as f:
+                saved_state = json.load(f)
+
+            assert saved_state["verification_count"] == 1
+
+
+class TestStopHookLock:
+    """Tests for the stop hook lock file."""
+
+    @pytest.fixture
+    def state_dir(self, temp_dir, monkeypatch):
+        test_state_dir = Path(temp_dir) / "state"
+        monkeypatch.setattr(SessionState, 'STATE_DIR', test_state_dir)
+        return test_state_dir
+
+    def test_acquire_and_release(self, state_dir):
+        """Test that the lock is exclusive until released."""
+        assert SessionState.acquire_stop_hook_lock("s1") is True
+        assert SessionState.acquire_stop_hook_lock("s1") is False
+        # Locks are per session
+        assert SessionState.acquire_stop_hook_lock("s2") is True
+
+        SessionState.release_stop_hook_lock("s1")
+        assert SessionState.acquire_stop_hook_lock("s1") is True
+
+    def test_acquire_does_not_load_state(self, state_dir):
+        """Test that checking the lock never reads the state file."""
+        with patch.object(SessionState, '_load_or_create') as mock_load:
+            SessionState.acquire_stop_hook_lock("s1")
+            SessionState.acquire_stop_hook_lock("s1")
+        mock_load.assert_not_called()
+
+    def test_stale_lock_is_taken_over(self, state_dir):
+        """Test that a lock left by a dead run doesn't block forever."""
+        assert SessionState.acquire_stop_hook_lock("s1") is True
+        lock_file = state_dir / "verify_claims_state_s1.lock"
+        old_time = time.time() - 600
+        os.utime(lock_file, (old_time, old_time))
+
+        assert SessionState.acquire_stop_hook_lock("s1", stale_after=300) is True
+        # Taking over leaves a fresh lock and nothing else behind
+        assert SessionState.acquire_stop_hook_lock("s1", stale_after=300) is False
+        assert os.listdir(state_dir) == ["verify_claims_state_s1.lock"]
+
+    def test_fresh_lock_moved_aside_is_restored(self, state_dir):
+        """Test that a lock replaced after the staleness check is put back."""
+        assert SessionState.acquire_stop_hook_lock("s1") is True
+        lock_file = state_dir / "verify_claims_state_s1.lock"
+
+        # The lock looked stale when checked, but is fresh by the time it is moved
+        assert SessionState._take_over_stale_lock(lock_file, "s1", stale_after=300) is False
+        assert os.listdir(state_dir) == ["verify_claims_state_s1.lock"]
+
+    def test_release_without_lock(self, state_dir):
+        """Test that releasing a lock that isn't held is a no-op."""
+        state_dir.mkdir()
+        SessionState.release_stop_hook_lock("missing")
+        assert not (state_dir / "verify_claims_state_missing.lock").exists()
 
 
 class TestSessionStateCleanup:
@@ -180,6 +298,19 @@ class TestSessionStateCleanup:
         assert not old_file.exists()
         assert new_file.exists()
 
+    def test_cleanup_old_lock_files(self, temp_dir, monkeypatch):
+        """Test that abandoned lock files are cleaned up too."""
+        test_state_dir = Path(temp_dir)
+        monkeypatch.setattr(SessionState, 'STATE_DIR', test_state_dir)
+
+        lock_file = test_state_dir / "verify_claims_state_old.lock"
+        lock_file.touch()
+        old_time = time.time() - (35 * 24 * 60 * 60)
+        os.utime(lock_file, (old_time, old_time))
+
+        assert SessionState.cleanup_old_states(max_age_days=30) == 1
+        assert not lock_file.exists()
+
     def test_cleanup_nonexistent_directory(self, temp_dir, monkeypatch):
         """Test cleanup when state directory doesn't exist."""
         nonexistent_dir = Path(temp_dir) / "nonexistent"
@@ -2,6 +2,7 @@
 
 import json
 from pathlib import Path
+from unittest.mock import patch
 
 from transcript_reader import (
     extract_assistant_text,
@@ -9,6 +10,7 @@ from transcript_reader import (
     get_recent_assistant_text,
     read_transcript,
 )
+from utils import jsonio
 
 
 class TestReadTranscript:
@@ -57,6 +59,18 @@ class TestReadTranscript:
         assert len(messages) == 2
 
 
+    def test_skip_invalid_utf8_lines(self, temp_dir):
+        """Test that lines that aren't valid UTF-8 are skipped."""
+        transcript_path = Path(temp_dir) / "binary.jsonl"
+        with open(transcript_path, 'wb') as f:
+            f.write(b'{"type": "user", "message": "caf\xc3\xa9"}\n')
+            f.write(b'{"type": "user", "message": "\xff\xfe"}\n')
+            f.write(b'{"type": "assistant", "message": "hi"}\n')
+
+        messages = list(read_transcript(str(transcript_path)))
+        assert [m["message"] for m in messages] == ["caf\u00e9", "hi"]
+
+
 class TestGetLastAssistantMessages:
     """Tests for the get_last_assistant_messages function."""
 
@@ -80,6 +94,59 @@ class TestGetLastAssistantMessages:
         messages = get_last_assistant_messages(str(empty_file), count=3)
         assert messages == []
 
+    def test_missing_file(self, temp_dir):
+        """Test that a missing transcript gives no messages."""
+        assert get_last_assistant_messages(str(Path(temp_dir) / "missing.jsonl")) == []
+
+    def test_order_and_filtering(self, temp_dir):
+        """Test that the last N assistant messages come back oldest first."""
+        lines = [
+            {"type": "assistant", "content": "one"},
+            {"type": "user", "content": "mentions \"assistant\" in text"},
+            {"type": "assistant", "content": "two"},
+            {"type": "assistant", "content": "three"},
+            {"type": "user", "content": "last"},
+        ]
+        path = Path(temp_dir) / "transcript.jsonl"
+        path.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+
+        messages = get_last_assistant_messages(str(path), count=2)
+        assert [m["content"] for m in messages] == ["two", "three"]
+
+    def test_without_trailing_newline(self, temp_dir):
+        """Test that the first and last lines are found without surrounding newlines."""
+        lines = [{"type": "assistant", "content": f"message {i} " + "x" * 40} for i in range(4)]
+        path = Path(temp_dir) / "transcript.jsonl"
+        path.write_text("\n".join(json.dumps(line) for line in lines))
+
+        messages = get_last_assistant_messages(str(path), count=4)
+        assert messages == lines
+
+    def test_blank_lines_between_messages(self, temp_dir):
+        """Test that blank lines and runs of newlines are skipped."""
+        path = Path(temp_dir) / "transcript.jsonl"
+        path.write_text(
+            "\n\n" + json.dumps({"type": "assistant", "content": "a"})
+            + "\n\n\n" + json.dumps({"type": "assistant", "content": "b"}) + "\n\n"
+        )
+
+        messages = get_last_assistant_messages(str(path), count=3)
+        assert [m["content"] for m in messages] == ["a", "b"]
+
+    def test_stops_reading_once_found(self, temp_dir):
+        """Test that earlier lines aren't parsed once enough messages are found."""
+        path = Path(temp_dir) / "transcript.jsonl"
+        path.write_text(
+            '{"type": "assistant", "content": "old" BROKEN\n'
+            + json.dumps({"type": "assistant", "content": "new"}) + "\n"
+        )
+
+        with patch('transcript_reader.jsonio.loads', wraps=jsonio.loads) as mock_loads:
+            messages = get_last_assistant_messages(str(path), count=1)
+
+        assert [m["content"] for m in messages] == ["new"]
+        assert mock_loads.call_count == 1
+
 
 class TestExtractAssistantText:
     """Tests for the extract_assistant_text function."""
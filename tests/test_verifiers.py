@@ -1,13 +1,20 @@
 """Tests for verifiers."""
 
 import json
+import os
+import subprocess
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
-from verifiers import verify_claim
+import pytest
+import verifiers
+from verifiers import VerificationResult, verify_claim, verify_claims_concurrently
 from verifiers.build_checker import detect_build_command, verify_build_success
+from verifiers.command_runner import CommandResult
 from verifiers.file_exists import verify_file_exists
-from verifiers.git_diff import verify_changes_made
+from verifiers.git_diff import is_code_file, parse_status, verify_changes_made
 from verifiers.lint_checker import detect_lint_command, verify_lint_clean
 from verifiers.test_runner import detect_test_command, verify_tests_pass
 
@@ -60,6 +67,29 @@ class TestVerifyFileExists:
         result = verify_file_exists("src", temp_project_dir, {})
         assert result.passed is False
         assert "not a file" in result.message.lower()
+        assert result.details["is_directory"] is True
+
+    def test_file_exists_reports_size(self, temp_project_dir):
+        """Test that the file size is included in the details."""
+        (Path(temp_project_dir) / "data.txt").write_text("12345")
+
+        result = verify_file_exists("data.txt", temp_project_dir, {})
+        assert result.details["size"] == 5
+
+    def test_parent_exists_reported(self, temp_project_dir):
+        """Test that a missing file reports whether its directory exists."""
+        result = verify_file_exists("nested/missing.txt", temp_project_dir, {})
+        assert result.details["parent_exists"] is False
+
+        result = verify_file_exists("missing.txt", temp_project_dir, {})
+        assert result.details["parent_exists"] is True
+
+    @pytest.mark.parametrize("file_path", ["x" * 5000 + ".txt", "bad\0name.txt"])
+    def test_unstatable_path_reported_missing(self, temp_project_dir, file_path):
+        """Test that paths stat can't handle are reported as missing, not as errors."""
+        result = verify_file_exists(file_path, temp_project_dir, {})
+        assert result.passed is False
+        assert "does not exist" in result.message.lower()
 
     def test_missing_path_parameter(self, temp_project_dir):
         """Test verification with missing path."""
@@ -79,32 +109,68 @@ class TestDetectTestCommand:
     def test_detect_npm_test(self, npm_project):
         """Test detection of npm test command."""
         command, framework = detect_test_command(npm_project)
-        assert command == "npm test"
+        assert command == ("npm", "test")
         assert framework == "npm"
 
     def test_detect_pytest(self, python_project):
         """Test detection of pytest command."""
         command, framework = detect_test_command(python_project)
-        assert command == "pytest"
+        assert command == ("pytest",)
         assert framework == "pytest"
 
     def test_detect_cargo_test(self, rust_project):
         """Test detection of cargo test command."""
         command, framework = detect_test_command(rust_project)
-        assert command == "cargo test"
+        assert command == ("cargo", "test")
         assert framework == "cargo"
 
     def test_detect_go_test(self, go_project):
         """Test detection of go test command."""
         command, framework = detect_test_command(go_project)
-        assert command == "go test ./..."
+        assert command == ("go", "test", "./...")
         assert framework == "go"
 
+    def test_detect_rspec_and_rake(self, temp_project_dir):
+        """Test that Ruby projects pick rspec or rake by test directory."""
+        (Path(temp_project_dir) / "Gemfile").write_text("source 'https://rubygems.org'\n")
+        assert detect_test_command(temp_project_dir) is None
+
+        (Path(temp_project_dir) / "test").mkdir()
+        assert detect_test_command(temp_project_dir) == (("bundle", "exec", "rake", "test"), "rake")
+
+        (Path(temp_project_dir) / "spec").mkdir()
+        assert detect_test_command(temp_project_dir) == (("bundle", "exec", "rspec"), "rspec")
+
+    def test_rule_priority(self, npm_project):
+        """Test that an earlier rule wins when several project types match."""
+        (Path(npm_project) / "pytest.ini").write_text("[pytest]\n")
+        (Path(npm_project) / "Cargo.toml").write_text("[package]\n")
+
+        assert detect_test_command(npm_project) == (("npm", "test"), "npm")
+
+    def test_falls_through_unmatched_rule(self, temp_project_dir):
+        """Test that a present marker whose rule finds nothing doesn't stop detection."""
+        (Path(temp_project_dir) / "setup.py").write_text("")
+        (Path(temp_project_dir) / "go.mod").write_text("module x\n")
+
+        assert detect_test_command(temp_project_dir) == (("go", "test", "./..."), "go")
+
     def test_no_test_framework(self, temp_project_dir):
         """Test when no test framework is detected."""
         result = detect_test_command(temp_project_dir)
         assert result is None
 
+    def test_detection_cached_until_markers_change(self, temp_project_dir):
+        """Test that detection isn't repeated until the project changes."""
+        assert detect_test_command(temp_project_dir) is None
+
+        with patch('verifiers.command_detection.os.scandir') as mock_scandir:
+            assert detect_test_command(temp_project_dir) is None
+        mock_scandir.assert_not_called()
+
+        (Path(temp_project_dir) / "Cargo.toml").write_text("[package]\n")
+        assert detect_test_command(temp_project_dir) == (("cargo", "test"), "cargo")
+
 
 class TestVerifyTestsPass:
     """Tests for the test runner verifier."""
@@ -121,33 +187,68 @@ class TestVerifyTestsPass:
         """Test that custom command is used when specified."""
         config = {"command": "echo 'tests pass'"}
 
-        with patch('verifiers.test_runner.subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        with patch('verifiers.test_runner.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=0, output_tail="")
             verify_tests_pass(None, temp_project_dir, config)
 
         mock_run.assert_called_once()
-        call_args = mock_run.call_args
-        # Command is now passed as a list via shlex.split() for security
-        assert call_args[0][0] == ["echo", "tests pass"]
+        # Command is passed as argv via shlex.split() for security
+        assert mock_run.call_args.args[0] == ("echo", "tests pass")
+
+    def test_detected_command_run_as_argv(self, npm_project):
+        """Test that a detected command is run as argv."""
+        with patch('verifiers.test_runner.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=0, output_tail="")
+            result = verify_tests_pass(None, npm_project, {})
+
+        assert mock_run.call_args.args[0] == ("npm", "test")
+        assert result.details["command"] == "npm test"
 
     def test_handles_test_failure(self, npm_project):
         """Test handling of test failures."""
-        with patch('verifiers.test_runner.subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(
+        with patch('verifiers.test_runner.run_command') as mock_run:
+            mock_run.return_value = CommandResult(
                 returncode=1,
-                stdout="FAIL: test_something",
-                stderr=""
+                output_tail="FAIL: test_something"
             )
             result = verify_tests_pass(None, npm_project, {})
 
         assert result.passed is False
         assert "failed" in result.message.lower()
+        assert result.details["output_tail"] == "FAIL: test_something"
+
+    def test_fail_fast_passes_framework_markers(self, npm_project):
+        """Test that fail_fast hands the framework's fail markers to the runner."""
+        with patch('verifiers.test_runner.run_command') as mock_run:
+            mock_run.return_value = CommandResult(
+                returncode=-9, output_tail="FAIL src/a.test.js", stopped_early=True
+            )
+            result = verify_tests_pass(None, npm_project, {"fail_fast": True, "no_cache": True})
+
+        assert mock_run.call_args.kwargs["fail_markers"] == (b"\nFAIL ",)
+        assert result.passed is False
+        assert result.details["stopped_early"] is True
+
+    def test_no_fail_markers_by_default(self, npm_project):
+        """Test that commands run to completion unless fail_fast is set."""
+        with patch('verifiers.test_runner.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=1, output_tail="")
+            result = verify_tests_pass(None, npm_project, {"no_cache": True})
+
+        assert mock_run.call_args.kwargs["fail_markers"] == ()
+        assert "stopped_early" not in result.details
+
+    def test_success_output_tail(self, npm_project):
+        """Test that a passing run keeps the last 500 characters of output."""
+        with patch('verifiers.test_runner.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=0, output_tail="a" * 900 + "END")
+            result = verify_tests_pass(None, npm_project, {})
+
+        assert result.details["stdout_tail"] == ("a" * 900 + "END")[-500:]
 
     def test_handles_timeout(self, npm_project):
         """Test handling of test timeout."""
-        import subprocess
-
-        with patch('verifiers.test_runner.subprocess.run') as mock_run:
+        with patch('verifiers.test_runner.run_command') as mock_run:
             mock_run.side_effect = subprocess.TimeoutExpired("npm test", 60)
             result = verify_tests_pass(None, npm_project, {"timeout": 60})
 
@@ -161,7 +262,7 @@ class TestDetectLintCommand:
     def test_detect_npm_lint(self, npm_project):
         """Test detection of npm lint command."""
         command, linter = detect_lint_command(npm_project)
-        assert command == "npm run lint"
+        assert command == ("npm", "run", "lint")
         assert linter == "npm"
 
     def test_detect_ruff(self, temp_project_dir):
@@ -170,7 +271,7 @@ class TestDetectLintCommand:
         ruff_config.write_text("[lint]\nselect = ['E', 'F']\n")
 
         command, linter = detect_lint_command(temp_project_dir)
-        assert command == "ruff check ."
+        assert command == ("ruff", "check", ".")
         assert linter == "ruff"
 
     def test_detect_cargo_clippy(self, rust_project):
@@ -179,6 +280,13 @@ class TestDetectLintCommand:
         assert "clippy" in command
         assert linter == "clippy"
 
+    def test_broken_package_json_skips_npm(self, temp_project_dir):
+        """Test that a malformed package.json doesn't count as an npm project."""
+        (Path(temp_project_dir) / "package.json").write_text('{"name": ')
+        (Path(temp_project_dir) / ".eslintrc.json").write_text("{}")
+
+        assert detect_lint_command(temp_project_dir) is None
+
     def test_no_linter_detected(self, temp_project_dir):
         """Test when no linter is detected."""
         result = detect_lint_command(temp_project_dir)
@@ -197,8 +305,8 @@ class TestVerifyLintClean:
 
     def test_lint_passes(self, npm_project):
         """Test when lint passes."""
-        with patch('verifiers.lint_checker.subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        with patch('verifiers.lint_checker.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=0, output_tail="")
             result = verify_lint_clean(None, npm_project, {})
 
         assert result.passed is True
@@ -206,17 +314,64 @@ class TestVerifyLintClean:
 
     def test_lint_fails(self, npm_project):
         """Test when lint fails."""
-        with patch('verifiers.lint_checker.subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(
+        with patch('verifiers.lint_checker.run_command') as mock_run:
+            mock_run.return_value = CommandResult(
                 returncode=1,
-                stdout="src/index.ts:10 error",
-                stderr=""
+                output_tail="src/index.ts:10 error"
             )
             result = verify_lint_clean(None, npm_project, {})
 
         assert result.passed is False
         assert "error" in result.message.lower()
 
+    def test_ruff_checks_changed_files_only(self, python_project):
+        """Test that ruff is given only the changed Python files in a git repo."""
+        subprocess.run(["git", "init", "-q"], cwd=python_project, check=True)
+        (Path(python_project) / "app.py").write_text("x = 1\n")
+        (Path(python_project) / "notes.md").write_text("notes\n")
+
+        with patch('verifiers.lint_checker.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=0, output_tail="")
+            result = verify_lint_clean(None, python_project,
+                                       {"no_cache": True, "changed_files_only": True})
+
+        assert mock_run.call_args.args[0] == ("ruff", "check", "--force-exclude", "app.py")
+        assert result.details["command"] == "ruff check --force-exclude app.py"
+
+    def test_ruff_full_run_without_changes(self, python_project):
+        """Test that ruff checks the whole tree when no Python files changed."""
+        subprocess.run(["git", "init", "-q"], cwd=python_project, check=True)
+
+        with patch('verifiers.lint_checker.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=0, output_tail="")
+            verify_lint_clean(None, python_project,
+                              {"no_cache": True, "changed_files_only": True})
+
+        assert mock_run.call_args.args[0] == ("ruff", "check", ".")
+
+    def test_ruff_changed_files_only_disabled(self, python_project):
+        """Test that changed_files_only can be turned off."""
+        subprocess.run(["git", "init", "-q"], cwd=python_project, check=True)
+        (Path(python_project) / "app.py").write_text("x = 1\n")
+        config = {"no_cache": True, "changed_files_only": False}
+
+        with patch('verifiers.lint_checker.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=0, output_tail="")
+            verify_lint_clean(None, python_project, config)
+
+        assert mock_run.call_args.args[0] == ("ruff", "check", ".")
+
+    def test_ruff_checks_whole_tree_by_default(self, python_project):
+        """Test that ruff checks the whole tree unless changed_files_only is set."""
+        subprocess.run(["git", "init", "-q"], cwd=python_project, check=True)
+        (Path(python_project) / "app.py").write_text("x = 1\n")
+
+        with patch('verifiers.lint_checker.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=0, output_tail="")
+            verify_lint_clean(None, python_project, {"no_cache": True})
+
+        assert mock_run.call_args.args[0] == ("ruff", "check", ".")
+
 
 class TestDetectBuildCommand:
     """Tests for build command detection."""
@@ -232,19 +387,19 @@ class TestDetectBuildCommand:
             json.dump(pkg, f)
 
         command, tool = detect_build_command(npm_project)
-        assert command == "npm run build"
+        assert command == ("npm", "run", "build")
         assert tool == "npm"
 
     def test_detect_cargo_build(self, rust_project):
         """Test detection of cargo build."""
         command, tool = detect_build_command(rust_project)
-        assert command == "cargo build"
+        assert command == ("cargo", "build")
         assert tool == "cargo"
 
     def test_detect_go_build(self, go_project):
         """Test detection of go build."""
         command, tool = detect_build_command(go_project)
-        assert command == "go build ./..."
+        assert command == ("go", "build", "./...")
         assert tool == "go"
 
     def test_detect_typescript(self, temp_project_dir):
@@ -269,8 +424,8 @@ class TestVerifyBuildSuccess:
 
     def test_build_succeeds(self, rust_project):
         """Test when build succeeds."""
-        with patch('verifiers.build_checker.subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        with patch('verifiers.build_checker.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=0, output_tail="")
             result = verify_build_success(None, rust_project, {})
 
         assert result.passed is True
@@ -278,17 +433,28 @@ class TestVerifyBuildSuccess:
 
     def test_build_fails(self, rust_project):
         """Test when build fails."""
-        with patch('verifiers.build_checker.subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(
+        with patch('verifiers.build_checker.run_command') as mock_run:
+            mock_run.return_value = CommandResult(
                 returncode=1,
-                stdout="error[E0308]: mismatched types",
-                stderr=""
+                output_tail="error[E0308]: mismatched types"
             )
             result = verify_build_success(None, rust_project, {})
 
         assert result.passed is False
         assert "failed" in result.message.lower()
 
+    def test_command_argv_and_details(self, rust_project):
+        """Test that detected and custom commands are run as argv and reported as strings."""
+        with patch('verifiers.build_checker.run_command') as mock_run:
+            mock_run.return_value = CommandResult(returncode=0, output_tail="")
+            detected = verify_build_success(None, rust_project, {})
+            custom = verify_build_success(None, rust_project, {"command": "make -j2 'all'"})
+
+        assert mock_run.call_args_list[0].args[0] == ("cargo", "build")
+        assert detected.details["command"] == "cargo build"
+        assert mock_run.call_args_list[1].args[0] == ("make", "-j2", "all")
+        assert custom.details["command"] == "make -j2 'all'"
+
 
 class TestVerifyChangesMade:
     """Tests for the git diff verifier."""
@@ -310,9 +476,10 @@ class TestVerifyChangesMade:
         with patch('verifiers.git_diff.subprocess.run') as mock_run:
             # Simulate having unstaged changes
             mock_run.side_effect = [
-                MagicMock(returncode=0, stdout=""),  # staged
-                MagicMock(returncode=0, stdout="src/main.py\n"),  # unstaged
-                MagicMock(returncode=0, stdout=""),  # untracked
+                MagicMock(
+                    returncode=0,
+                    stdout=b"1 .M N... 100644 100644 100644 abc abc src/main.py\0"
+                ),  # status
             ]
             result = verify_changes_made(None, temp_project_dir, {})
 
@@ -327,9 +494,7 @@ class TestVerifyChangesMade:
         with patch('verifiers.git_diff.subprocess.run') as mock_run:
             # Simulate no changes
             mock_run.side_effect = [
-                MagicMock(returncode=0, stdout=""),  # staged
-                MagicMock(returncode=0, stdout=""),  # unstaged
-                MagicMock(returncode=0, stdout=""),  # untracked
+                MagicMock(returncode=0, stdout=b""),  # status
                 MagicMock(returncode=0, stdout=""),  # recent commits
             ]
             result = verify_changes_made(None, temp_project_dir, {})
@@ -337,6 +502,56 @@ class TestVerifyChangesMade:
         assert result.passed is False
         assert "no code changes" in result.message.lower()
 
+    def test_git_error_skips(self, temp_project_dir):
+        """Test that a failing git status skips verification instead of failing it."""
+        (Path(temp_project_dir) / ".git").mkdir()
+
+        with patch('verifiers.git_diff.subprocess.run') as mock_run:
+            mock_run.return_value = MagicMock(returncode=128, stdout=b"")
+            result = verify_changes_made(None, temp_project_dir, {})
+
+        assert result.passed is True
+        assert result.details.get("skipped") is True
+
+    def test_undecodable_filename(self, temp_project_dir):
+        """Test that a file name that isn't UTF-8 still counts as a change."""
+        subprocess.run(["git", "init", "-q"], cwd=temp_project_dir, check=True)
+        with open(os.path.join(os.fsencode(temp_project_dir), b"bad\xff.py"), "w") as f:
+            f.write("x = 1\n")
+
+        result = verify_changes_made(None, temp_project_dir, {})
+
+        assert result.passed is True
+        assert result.details["new_files"] == ["bad\ufffd.py"]
+
+    def test_is_code_file(self):
+        """Test code file detection by extension."""
+        assert is_code_file("src/main.py")
+        assert is_code_file("App.TSX")
+        assert not is_code_file("README.md")
+        assert not is_code_file("Makefile")
+        assert not is_code_file("py")
+        assert not is_code_file("docs.d/notes")
+
+    def test_parse_status(self):
+        """Test splitting porcelain v2 status into staged, unstaged and untracked."""
+        output = b"\0".join([
+            b"1 M. N... 100644 100644 100644 aaa bbb staged.py",
+            b"1 .M N... 100644 100644 100644 aaa aaa unstaged file.py",
+            b"1 MM N... 100644 100644 100644 aaa bbb both.py",
+            b"2 R. N... 100644 100644 100644 aaa aaa R100 renamed.py",
+            b"original.py",
+            b"u UU N... 100644 100644 100644 100644 aaa bbb ccc conflict.py",
+            b"? new.py",
+            b"",
+        ])
+
+        staged, unstaged, untracked = parse_status(output)
+
+        assert staged == ["staged.py", "both.py", "renamed.py", "conflict.py"]
+        assert unstaged == ["unstaged file.py", "both.py", "conflict.py"]
+        assert untracked == ["new.py"]
+
 
 class TestVerifyClaim:
     """Tests for the main verify_claim function."""
@@ -374,9 +589,98 @@ class TestVerifyClaim:
         config = {"verifiers": {"file_created": {"enabled": True}}}
 
         # Pass an invalid path that might cause issues
-        with patch('verifiers.file_exists.os.path.exists') as mock_exists:
-            mock_exists.side_effect = PermissionError("Access denied")
+        with patch('verifiers.file_exists.os.stat') as mock_stat:
+            mock_stat.side_effect = RuntimeError("stat failed")
             result = verify_claim("file_created", "/some/path", temp_project_dir, config)
 
         assert result.passed is False
         assert "error" in result.message.lower()
+
+    def test_verifiers_mapping_resolves_lazily(self):
+        """Test that VERIFIERS and verifier functions are exposed by the package."""
+        assert verifiers.VERIFIERS["file_created"] is verify_file_exists
+        assert verifiers.VERIFIERS["bug_fixed"] is verify_changes_made
+        assert verifiers.verify_tests_pass is verify_tests_pass
+
+        with pytest.raises(AttributeError):
+            verifiers.verify_nothing  # noqa: B018
+
+
+class TestVerifyClaimsConcurrently:
+    """Tests for verifying several claims in parallel."""
+
+    def test_results_follow_claim_order(self, temp_project_dir):
+        """Test that results are returned in the same order as the claims."""
+        (Path(temp_project_dir) / "exists.txt").write_text("content")
+
+        results = verify_claims_concurrently(
+            [("file_created", "missing.txt"), ("unknown_type", None), ("file_created", "exists.txt")],
+            temp_project_dir,
+            {}
+        )
+
+        assert [r.passed for r in results] == [False, True, True]
+        assert results[1].details.get("skipped") is True
+
+    def test_verifiers_run_in_parallel(self, temp_project_dir):
+        """Test that slow verifiers overlap instead of running one after another."""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_other(claim_value, cwd, config):
+            # Only returns if both verifiers are running at the same time
+            barrier.wait()
+            return VerificationResult(passed=True, message=claim_value, details={})
+
+        with patch.dict(verifiers.__dict__, {"verify_file_exists": wait_for_other}), \
+                patch('verifiers.os.cpu_count', return_value=4):
+            results = verify_claims_concurrently(
+                [("file_created", "a"), ("file_created", "b")], temp_project_dir, {}
+            )
+
+        assert [r.message for r in results] == ["a", "b"]
+
+    def test_parallelism_capped_by_cpu_count(self, temp_project_dir):
+        """Test that no more verifiers run at once than there are CPUs."""
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def track_concurrency(claim_value, cwd, config):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return VerificationResult(passed=True, message=claim_value, details={})
+
+        claims = [("file_created", str(i)) for i in range(6)]
+        with patch.dict(verifiers.__dict__, {"verify_file_exists": track_concurrency}), \
+                patch('verifiers.os.cpu_count', return_value=2):
+            results = verify_claims_concurrently(claims, temp_project_dir, {})
+
+        assert [r.message for r in results] == [str(i) for i in range(6)]
+        assert peak == 2
+
+    def test_parallel_verify_disabled(self, temp_project_dir):
+        """Test that parallel_verify false runs verifiers on the calling thread."""
+        threads = []
+
+        def record_thread(claim_value, cwd, config):
+            threads.append(threading.current_thread())
+            return VerificationResult(passed=True, message=claim_value, details={})
+
+        config = {"behavior": {"parallel_verify": False}}
+        with patch.dict(verifiers.__dict__, {"verify_file_exists": record_thread}), \
+                patch('verifiers.os.cpu_count', return_value=4):
+            results = verify_claims_concurrently(
+                [("file_created", "a"), ("file_created", "b")], temp_project_dir, config
+            )
+
+        assert [r.message for r in results] == ["a", "b"]
+        assert threads == [threading.current_thread()] * 2
+
+    def test_empty_claims(self, temp_project_dir):
+        """Test that no claims gives no results."""
+        assert verify_claims_concurrently([], temp_project_dir, {}) == []